@@ -1,11 +1,19 @@
 from dash import dash, html, dcc, page_container
 import dash_bootstrap_components as dbc
+from src.metricas import instrumentar
+from src.api import registrar_api
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.MINTY, "https://cdn.jsdelivr.net/npm/bootstrap-icons/font/bootstrap-icons.css"], use_pages=True, pages_folder="pages")
 
 
 server = app.server
 
+# Latência dos callbacks, rota /metrics e perfilador opcional
+instrumentar(server)
+
+# Rota de atualização manual dos dados (POST /api/atualizar)
+registrar_api(server)
+
 
 # Configuração da NavBar
 navbar = dbc.Navbar(
@@ -21,6 +29,7 @@ navbar = dbc.Navbar(
                     dbc.NavItem(dbc.NavLink("Resumo da Rodada", href="/round_summary")),
                     dbc.NavItem(dbc.NavLink("Ranking de Jogadores", href="/player_ranking")),
                     dbc.NavItem(dbc.NavLink("Analítico por Jogador", href="/player_profile")),
+                    dbc.NavItem(dbc.NavLink("Simulador de Pontuação", href="/simulador")),
                     #
                 ], className="ms-auto", navbar=True),
                 width="auto"
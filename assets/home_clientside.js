@@ -0,0 +1,74 @@
+// Callbacks da HOME executados no navegador.
+// Os dados chegam uma vez em 'store-home' (tabela colunar jogador × competição, ver pages/home.py);
+// trocar competição ou métrica só refaz o top 5 e os cards aqui, sem ida ao servidor.
+(function () {
+    function top5(linhas, coluna) {
+        return linhas.slice().sort(function (a, b) { return b[coluna] - a[coluna]; }).slice(0, 5);
+    }
+
+    // Mesmo visual do px.bar horizontal (template plotly_white) usado antes no servidor
+    function graficoTop5(linhas, coluna, titulo, tituloEixo, cor) {
+        return {
+            data: [{
+                type: 'bar',
+                orientation: 'h',
+                x: linhas.map(function (linha) { return linha[coluna]; }),
+                y: linhas.map(function (linha) { return linha.PLAYER; }),
+                marker: {color: cor},
+                texttemplate: '%{x}',
+                textposition: 'auto',
+                hovertemplate: tituloEixo + '=%{x}<br>Jogador=%{y}<extra></extra>'
+            }],
+            layout: {
+                title: {text: titulo, x: 0.5, font: {size: 20}},
+                plot_bgcolor: 'white',
+                paper_bgcolor: 'white',
+                font: {color: '#38003D'},
+                xaxis: {title: {text: tituloEixo, font: {size: 14}}, gridcolor: '#EBF0F8', zerolinecolor: '#EBF0F8'},
+                yaxis: {title: {text: null}, type: 'category'},
+                margin: {t: 60}
+            }
+        };
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        home: {
+            atualizar_graficos: function (dados, competicao, metrica) {
+                if (!dados) {
+                    throw window.dash_clientside.PreventUpdate;
+                }
+
+                // Linhas da competição selecionada
+                var colunas = dados.jogadores;
+                var linhas = [];
+                for (var i = 0; i < colunas['COMPETIÇÃO'].length; i++) {
+                    if (colunas['COMPETIÇÃO'][i] === competicao) {
+                        linhas.push({
+                            PLAYER: colunas.PLAYER[i],
+                            PTS: colunas.PTS[i],
+                            GOL: colunas.GOL[i],
+                            ASS: colunas.ASS[i]
+                        });
+                    }
+                }
+
+                // Estatísticas
+                var contagens = dados.contagens[competicao] || {partidas: 0, rodadas: 0};
+                var totalGols = linhas.reduce(function (soma, linha) { return soma + linha.GOL; }, 0);
+
+                // Top 1 jogador
+                var top5Pts = top5(linhas, 'PTS');
+                var top1 = top5Pts.length ? top5Pts[0].PLAYER : "Sem dados";
+
+                var nomeMetrica = metrica === 'GOL' ? 'Gols' : 'Assistências';
+                var figPts = graficoTop5(top5Pts, 'PTS', "Top 5 Jogadores - Pontos (" + competicao + ")", "Pontos", "#38003D");
+                var figMetrica = graficoTop5(
+                    top5(linhas, metrica), metrica,
+                    "Top 5 Jogadores - " + nomeMetrica + " (" + competicao + ")", "Quantidade", "#5D9231"
+                );
+
+                return [figPts, figMetrica, contagens.partidas, top1, totalGols, contagens.rodadas];
+            }
+        }
+    });
+})();
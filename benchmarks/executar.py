@@ -0,0 +1,163 @@
+"""
+Micro-benchmarks dos caminhos de dados e dos callbacks, em temporadas sintéticas de vários tamanhos.
+
+Os dados vêm da fonte CSV local (FONTE_DADOS=csv), então nada acessa a rede.
+O resultado sai em JSON para comparar commits:
+
+    python -m benchmarks.executar --rodadas 10 40 160 --saida bench.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import importlib
+import inspect
+import statistics
+import subprocess
+
+# Configuração que precisa estar no ambiente antes de importar src/app
+os.environ['DADOS_SNAPSHOT_PASTA'] = ''       # sem snapshot em disco
+os.environ['DADOS_TTL_SEGUNDOS'] = '1e9'      # sem recargas em segundo plano durante a medição
+
+import pandas as pd
+from benchmarks.gerador_liga import gerar_temporada
+
+
+def cronometrar(funcao, repeticoes: int, preparar=None) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        'min_ms': round(min(tempos), 3),
+        'mediana_ms': round(statistics.median(tempos), 3),
+        'repeticoes': repeticoes,
+    }
+
+
+def carregar_paginas():
+    """
+    Instancia o app (que registra as páginas) e devolve os módulos das páginas já importados pelo Dash.
+    """
+    importlib.import_module('app')
+    return {
+        nome: sys.modules.get(f'pages.{nome}') or importlib.import_module(f'pages.{nome}')
+        for nome in ['home', 'player_ranking', 'player_profile', 'round_summary', 'simulador']
+    }
+
+
+def medir_tamanho(paginas: dict, rodadas: int, args) -> dict:
+    from src.data_loader import obter_snapshot, tratar_dataframe, CRITERIOS
+    from src.pontuacao import simular_cenarios
+    from src.agregados import calcular_agregados
+    from src.similaridade import construir_similaridade
+    from src.quimica import construir_quimica
+    from src.cache_figuras import CACHE_FIGURAS
+
+    brutas = gerar_temporada(
+        jogadores=args.jogadores,
+        rodadas=rodadas,
+        partidas_por_rodada=args.partidas_por_rodada,
+        fracao_copa=args.fracao_copa,
+    )
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'main.csv')
+        brutas.to_csv(caminho, index=False)
+        os.environ['FONTE_DADOS'] = 'csv'
+        os.environ['FONTE_DADOS_CAMINHO'] = caminho
+
+        repeticoes = args.repeticoes
+        tempos = {}
+
+        # Caminho de dados
+        copias = iter([brutas.copy() for _ in range(repeticoes)])
+        tempos['tratar_dataframe'] = cronometrar(lambda: tratar_dataframe(next(copias)), repeticoes)
+
+        snapshot = obter_snapshot()
+        df = snapshot.df
+        tempos['calcular_agregados'] = cronometrar(lambda: calcular_agregados(df), repeticoes)
+
+        # 50 conjuntos de critérios alternativos avaliados de uma vez, sobre as linhas brutas da temporada
+        cenarios = {f'cenario_{i}': {posicao: {col: peso * (1 + i / 50) for col, peso in pesos.items()} for posicao, pesos in CRITERIOS.items()} for i in range(50)}
+        tempos['simular_cenarios[50]'] = cronometrar(lambda: simular_cenarios(df, cenarios, CRITERIOS), repeticoes)
+
+        # Vizinhos mais próximos: uma consulta (página de perfil) e todos os jogadores em lote
+        matriz = construir_similaridade(df).competicoes['Todas']
+        jogadores = list(matriz.jogadores)
+        tempos['similaridade.vizinhos[1]'] = cronometrar(lambda: matriz.vizinhos(jogadores[:1]), repeticoes)
+        tempos['similaridade.vizinhos[todos]'] = cronometrar(lambda: matriz.vizinhos(jogadores), repeticoes)
+
+        tempos['construir_quimica'] = cronometrar(lambda: construir_quimica(df), repeticoes)
+
+        def frio():
+            # Sem tabelas pré-calculadas e sem figuras em cache: custo da primeira requisição após uma recarga
+            snapshot.limpar_derivados()
+            CACHE_FIGURAS.limpar()
+
+        jogador = df['PLAYER'].iloc[0]
+        rodada = int(df.loc[df['COMPETIÇÃO'] == 'LIGA', 'RODADA'].iloc[0])
+        callbacks = {
+            'player_ranking.carregar_tabela': (paginas['player_ranking'].carregar_tabela, ('Todas', 'Todas', 'Todas', 0, 25, [{'column_id': 'GOL', 'direction': 'desc'}], '')),
+            'home.carregar_dados_home': (paginas['home'].carregar_dados_home, ('Todas',)),
+            'player_profile.atualizar_perfil': (paginas['player_profile'].atualizar_perfil, ('Todas', jogador)),
+            'round_summary.atualizar_graficos_round': (paginas['round_summary'].atualizar_graficos_round, ('Todas', 'LIGA', rodada, 'GOL')),
+            'simulador.simular': (paginas['simulador'].simular, ('Todas', 'Todas', paginas['simulador'].PESOS_ATUAIS, {}, 'Editado')),
+        }
+        for nome, (callback, entradas) in callbacks.items():
+            # Sem fixar_snapshot nem memoizar_por_snapshot; o callback completo recebe a versão fixada (None = atual)
+            sem_memo = inspect.unwrap(callback)
+            tempos[f'{nome}[frio]'] = cronometrar(lambda: sem_memo(*entradas), repeticoes, preparar=frio)
+            tempos[f'{nome}[agregados_prontos]'] = cronometrar(lambda: sem_memo(*entradas), repeticoes)
+            tempos[f'{nome}[cache_figuras]'] = cronometrar(lambda: callback(*entradas, None), repeticoes)
+
+    return {
+        'rodadas': rodadas,
+        'linhas': len(brutas),
+        'jogadores': int(df['PLAYER'].nunique()),
+        'tempos': tempos,
+    }
+
+
+def commit_atual() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rodadas', type=int, nargs='+', default=[10, 40, 160])
+    parser.add_argument('--jogadores', type=int, default=60)
+    parser.add_argument('--partidas-por-rodada', type=int, default=3)
+    parser.add_argument('--fracao-copa', type=float, default=0.25)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--saida', help='arquivo JSON de saída (padrão: stdout)')
+    args = parser.parse_args()
+
+    paginas = carregar_paginas()
+    resultado = {
+        'commit': commit_atual(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'parametros': vars(args),
+        'tamanhos': [medir_tamanho(paginas, rodadas, args) for rodadas in args.rodadas],
+    }
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+
+
+if __name__ == '__main__':
+    main()
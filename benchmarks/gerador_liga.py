@@ -0,0 +1,96 @@
+"""
+Gerador de temporadas sintéticas no formato da aba "main".
+
+Cada rodada tem várias partidas entre dois times; os jogadores têm posição fixa e
+as estatísticas seguem o placar (V/E/D, STG, GS), então as páginas se comportam como com dados reais.
+"""
+import numpy as np
+import pandas as pd
+
+COLUNAS_MAIN = [
+    'DATA', 'COMPETIÇÃO', 'RODADA', 'PARTIDA', 'PLAYER', 'POSIÇÃO', 'TIME',
+    'V', 'E', 'D', 'GOL', 'ASS', 'STG', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP', 'FALTA'
+]
+TIMES = ['Roxo', 'Verde', 'Branco', 'Preto', 'Azul', 'Laranja']
+# Formação de cada time em campo
+FORMACAO = ['GK', 'ZAG', 'ZAG', 'MEI', 'MEI', 'ATA']
+
+
+def gerar_temporada(
+    jogadores: int = 60,
+    rodadas: int = 30,
+    partidas_por_rodada: int = 3,
+    fracao_copa: float = 0.25,
+    semente: int = 0,
+) -> pd.DataFrame:
+    """
+    Gera uma temporada com `rodadas` rodadas, das quais `fracao_copa` são de COPA (numeradas à parte).
+    Retorna tudo como texto, como o get_as_dataframe(dtype=str) entrega.
+    """
+    rng = np.random.default_rng(semente)
+    elenco = pd.DataFrame({
+        'PLAYER': [f"Jogador {i:04d}" for i in range(jogadores)],
+        'POSIÇÃO': [FORMACAO[i % len(FORMACAO)] for i in range(jogadores)],
+    })
+    por_posicao = {posicao: elenco[elenco['POSIÇÃO'] == posicao]['PLAYER'].to_numpy() for posicao in set(FORMACAO)}
+
+    rodadas_copa = int(round(rodadas * fracao_copa))
+    calendario = [('LIGA', r) for r in range(1, rodadas - rodadas_copa + 1)] + [('COPA', r) for r in range(1, rodadas_copa + 1)]
+
+    linhas = []
+    data = pd.Timestamp('2025-01-04')
+    for competicao, rodada in calendario:
+        for partida in range(1, partidas_por_rodada + 1):
+            times = rng.choice(TIMES, 2, replace=False)
+            escalados = _escalar_partida(rng, por_posicao)
+            gols = rng.poisson(2.2, 2)
+            for lado, (time, escalacao) in enumerate(zip(times, escalados)):
+                feitos, sofridos = gols[lado], gols[1 - lado]
+                autores = rng.choice(len(escalacao), feitos, p=_pesos_gol(escalacao))
+                for i, (jogador, posicao) in enumerate(escalacao):
+                    linhas.append(_linha(
+                        rng, data, competicao, rodada, partida, jogador, posicao, time,
+                        feitos, sofridos, int((autores == i).sum())
+                    ))
+        data += pd.Timedelta(days=7)
+
+    return pd.DataFrame(linhas, columns=COLUNAS_MAIN).astype(str)
+
+
+def _escalar_partida(rng, por_posicao: dict) -> list:
+    """
+    Sorteia as duas escalações da partida sem repetir jogador (se o elenco da posição permitir).
+    """
+    escalacoes = [[], []]
+    for posicao in dict.fromkeys(FORMACAO):
+        vagas = FORMACAO.count(posicao)
+        candidatos = por_posicao[posicao]
+        sorteados = rng.choice(candidatos, 2 * vagas, replace=len(candidatos) < 2 * vagas)
+        for lado in range(2):
+            escalacoes[lado] += [(jogador, posicao) for jogador in sorteados[lado * vagas:(lado + 1) * vagas]]
+    return escalacoes
+
+
+def _pesos_gol(escalacao: list) -> np.ndarray:
+    pesos = np.array([{'GK': 0.02, 'ZAG': 0.1, 'MEI': 0.3, 'ATA': 0.6}[posicao] for _, posicao in escalacao])
+    return pesos / pesos.sum()
+
+
+def _linha(rng, data, competicao, rodada, partida, jogador, posicao, time, feitos, sofridos, gols_jogador) -> list:
+    goleiro = posicao == 'GK'
+    return [
+        data.strftime('%d/%m/%Y'), competicao, rodada, partida, jogador, posicao, time,
+        int(feitos > sofridos), int(feitos == sofridos), int(feitos < sofridos),
+        gols_jogador,
+        rng.poisson(0.3),                          # ASS
+        int(sofridos == 0 and posicao in ('GK', 'ZAG')),  # STG
+        rng.binomial(1, 0.02),                     # GC
+        rng.binomial(1, 0.08),                     # AMA
+        rng.binomial(1, 0.02),                     # AZUL
+        rng.binomial(1, 0.01),                     # VER
+        rng.binomial(1, 0.01),                     # PP
+        sofridos if goleiro else 0,                # GS
+        rng.poisson(1.5) if goleiro else 0,        # DD
+        rng.binomial(1, 0.05) if goleiro else 0,   # DP
+        rng.poisson(0.5),                          # FALTA
+    ]
@@ -0,0 +1,74 @@
+"""
+Tempo de inicialização do app: importação do app.py (com o registro de todas as páginas) num processo novo.
+
+Cada repetição roda num interpretador limpo; o resultado traz a mediana e os módulos mais caros
+segundo o `python -X importtime`:
+
+    python -m benchmarks.inicializacao --repeticoes 5 --saida inicio.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+# Só a importação: sem snapshot em disco e sem carga de dados
+AMBIENTE = {**os.environ, 'DADOS_SNAPSHOT_PASTA': ''}
+
+CODIGO = "import time; inicio = time.perf_counter(); import app; print(time.perf_counter() - inicio)"
+
+
+def medir_importacao() -> float:
+    saida = subprocess.run([sys.executable, '-c', CODIGO], capture_output=True, text=True, check=True, env=AMBIENTE)
+    return float(saida.stdout.strip().splitlines()[-1]) * 1000
+
+
+def modulos_mais_caros(quantidade: int) -> list:
+    """
+    Módulos importados diretamente pelo app.py e pelas páginas (nível logo abaixo do app), pelo tempo acumulado.
+    """
+    saida = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                           capture_output=True, text=True, check=True, env=AMBIENTE)
+    modulos = {}
+    for linha in saida.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, acumulado, nome = linha[len('import time:'):].split('|')
+        # Um espaço depois do "|" e dois por nível de aninhamento
+        nome = nome.rstrip()
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        if nivel == 1:
+            modulos[nome.strip()] = max(modulos.get(nome.strip(), 0), int(acumulado) / 1000)
+    mais_caros = sorted(modulos.items(), key=lambda item: item[1], reverse=True)[:quantidade]
+    return [{'modulo': nome, 'acumulado_ms': round(ms, 1)} for nome, ms in mais_caros]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--modulos', type=int, default=15, help='quantidade de módulos no ranking do importtime')
+    parser.add_argument('--saida', help='arquivo JSON de saída (padrão: stdout)')
+    args = parser.parse_args()
+
+    tempos = [medir_importacao() for _ in range(args.repeticoes)]
+    resultado = {
+        'importar_app': {
+            'min_ms': round(min(tempos), 1),
+            'mediana_ms': round(statistics.median(tempos), 1),
+            'repeticoes': args.repeticoes,
+        },
+        'modulos_mais_caros': modulos_mais_caros(args.modulos),
+    }
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto)
+    else:
+        print(texto)
+
+
+if __name__ == '__main__':
+    main()
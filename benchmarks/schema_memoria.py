@@ -0,0 +1,72 @@
+"""
+Compara o DataFrame tratado antes e depois do schema tipado:
+memória (memory_usage deep) e tempo dos agrupamentos usados pelas páginas.
+
+O formato anterior é medido duas vezes: com os textos em object (como o pandas 2 guarda o dtype=str)
+e com o tipo de texto padrão do pandas instalado (no pandas 3, str em Arrow).
+
+Uso: python -m benchmarks.schema_memoria --rodadas 1000
+"""
+import argparse
+import json
+import time
+import pandas as pd
+from src.data_loader import tratar_dataframe, CRITERIOS
+from src.pontuacao import calcular_pontos
+from benchmarks.gerador_liga import gerar_temporada
+
+COLUNAS_EVENTOS = ['V', 'E', 'D', 'GOL', 'ASS', 'STG', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP', 'FALTA']
+
+
+def tratar_sem_schema(df: pd.DataFrame, textos_object: bool = False) -> pd.DataFrame:
+    """
+    Tratamento anterior ao schema tipado: contagens em int64 e o restante como texto.
+    """
+    if textos_object:
+        df = df.astype(object)
+    for col in COLUNAS_EVENTOS:
+        df[col] = pd.to_numeric(df[col].fillna(0), errors='coerce').fillna(0).astype(int)
+    df['PTS'] = calcular_pontos(df, CRITERIOS)
+    return df
+
+
+def cronometrar(funcao, repeticoes: int = 5) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def medir(df: pd.DataFrame) -> dict:
+    return {
+        'memoria_mb': round(df.memory_usage(deep=True).sum() / 1e6, 3),
+        'groupby_player_s': cronometrar(lambda: df.groupby('PLAYER', observed=True)['PTS'].sum()),
+        'groupby_rodada_player_s': cronometrar(
+            lambda: df.groupby(['COMPETIÇÃO', 'RODADA', 'PLAYER'], observed=True)[COLUNAS_EVENTOS].sum()
+        ),
+        'groupby_time_partida_s': cronometrar(
+            lambda: df.groupby(['COMPETIÇÃO', 'RODADA', 'PARTIDA', 'TIME'], observed=True)[['V', 'E', 'D']].max()
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rodadas', type=int, default=1000)
+    args = parser.parse_args()
+
+    brutas = gerar_temporada(jogadores=200, rodadas=args.rodadas, partidas_por_rodada=4)
+    resultado = {
+        'linhas': len(brutas),
+        'pandas': pd.__version__,
+        'antes_object': medir(tratar_sem_schema(brutas.copy(), textos_object=True)),
+        'antes': medir(tratar_sem_schema(brutas.copy())),
+        'depois': medir(tratar_dataframe(brutas.copy())),
+    }
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == '__main__':
+    main()
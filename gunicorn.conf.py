@@ -0,0 +1,53 @@
+"""
+Configuração do gunicorn (lida automaticamente pelo `gunicorn app:server` do Procfile).
+
+Com GUNICORN_PRELOAD=1 o app é importado uma única vez no processo mestre, que também carrega e trata
+os dados e monta as estruturas derivadas antes de criar os workers. Os workers herdam tudo por
+copy-on-write e respondem à primeira requisição sem esperar pela planilha.
+"""
+import os
+import gc
+import time
+
+preload_app = os.environ.get("GUNICORN_PRELOAD") == "1"
+
+
+def when_ready(server):
+    # Roda no mestre, depois de importar o app (preload) e antes do fork dos workers
+    if not preload_app:
+        return
+
+    from src.data_loader import aquecer, listar_temporadas, TODAS
+    from src.agregados import calcular_agregados
+    from src.indices import indexar_jogadores, particionar_rodadas
+    from src.linha_do_tempo import construir_linha_do_tempo
+    from src.similaridade import construir_similaridade
+    from src.quimica import construir_quimica
+
+    # Mesmas chaves e construtores dos obter_* chamados pelas páginas
+    derivados = [
+        ('agregados', calcular_agregados),
+        ('indice_jogadores', indexar_jogadores),
+        ('indice_rodadas', particionar_rodadas),
+        ('linha_do_tempo', construir_linha_do_tempo),
+        ('similaridade', construir_similaridade),
+        ('quimica', construir_quimica),
+    ]
+
+    inicio = time.perf_counter()
+    snapshot = aquecer()
+    if snapshot is None:
+        server.log.warning("Pré-carga dos dados falhou; os workers carregam na primeira requisição")
+        return
+
+    # Tudo sai direto do snapshot aquecido: os obter_* passariam pelo obter_snapshot(), que pode agendar
+    # uma recarga em thread de fundo (TTL vencido, marca .forcar) no mestre, antes do fork
+    temporadas = snapshot.derivado('temporadas', listar_temporadas)
+    # Mesmas estruturas que as páginas pedem ao abrir: todas as temporadas e a mais recente
+    for temporada in dict.fromkeys([TODAS] + temporadas[-1:]):
+        for chave, construtor in derivados:
+            snapshot.derivado(chave, construtor, temporada)
+
+    # Objetos já criados saem do rastreamento do GC: as coletas nos workers não tocam (e não copiam) essas páginas
+    gc.freeze()
+    server.log.info(f"Dados pré-carregados: {len(snapshot.df)} linhas em {time.perf_counter() - inicio:.2f}s")
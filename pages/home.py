@@ -1,13 +1,21 @@
-from dash import html, dcc, register_page, Output, Input, callback
+from dash import html, dcc, register_page, Output, Input, State, callback, clientside_callback, ClientsideFunction
 import dash_bootstrap_components as dbc
-import plotly.express as px
-from src.data_loader import carregar_dados_google_sheets
+import pandas as pd
+from src.agregados import obter_agregados, TODAS
+from src.data_loader import obter_snapshot, fixar_snapshot, obter_temporadas
+from src.cache_figuras import memoizar_por_snapshot
 
 # Registrar esta página
 register_page(__name__, path="/")
 
 # Layout da página
 layout = dbc.Container([
+    # Versão dos dados desta renderização (todos os callbacks da página leem a mesma)
+    dcc.Store(id='store-versao-home'),
+
+    # Tabela agregada usada pelos callbacks do navegador
+    dcc.Store(id='store-home'),
+
     # Cards de informações
     dbc.Row([
         dbc.Col(
@@ -50,6 +58,16 @@ layout = dbc.Container([
 
     # Dropdowns de filtros
     dbc.Row([
+        dbc.Col([
+            html.Label("Temporada:", className="mb-2 fw-bold", style={"color": "#38003D"}),
+            dcc.Dropdown(
+                id='dropdown-temporada-home',
+                options=[],  # Opções carregadas a partir das temporadas do snapshot
+                clearable=False,
+                style={"width": "80%"}
+            )
+        ], md=4),
+
         dbc.Col([
             html.Label("Filtrar por Competição:", className="mb-2 fw-bold", style={"color": "#38003D"}),
             dcc.Dropdown(
@@ -63,7 +81,7 @@ layout = dbc.Container([
                 clearable=False,
                 style={"width": "80%"}
             )
-        ], md=6),
+        ], md=4),
 
         dbc.Col([
             html.Label("Escolher Métrica:", className="mb-2 fw-bold", style={"color": "#38003D"}),
@@ -77,7 +95,7 @@ layout = dbc.Container([
                 clearable=False,
                 style={"width": "80%"}
             )
-        ], md=6)
+        ], md=4)
     ]),
 
     # Gráficos
@@ -93,79 +111,60 @@ layout = dbc.Container([
     ])
 ], fluid=True)
 
-# Callback para atualizar todos os dados
+# Callback para carregar as temporadas disponíveis (a mais recente vem selecionada)
+@callback(
+    Output('dropdown-temporada-home', 'options'),
+    Output('dropdown-temporada-home', 'value'),
+    Output('store-versao-home', 'data'),
+    Input('dropdown-temporada-home', 'id')  # Dummy Input para carregar ao iniciar
+)
+def carregar_temporadas_home(_):
+    versao = obter_snapshot().impressao
+    temporadas = obter_temporadas()
+    options = [{"label": "Todas", "value": TODAS}] + [{"label": temporada, "value": temporada} for temporada in temporadas]
+    return options, temporadas[-1] if temporadas else TODAS, versao
+
+# Callback que envia ao navegador a tabela compacta jogador × competição (uma vez por temporada escolhida)
 @callback(
+    Output('store-home', 'data'),
+    Input('dropdown-temporada-home', 'value'),
+    State('store-versao-home', 'data')
+)
+@fixar_snapshot
+@memoizar_por_snapshot
+def carregar_dados_home(temporada):
+    agregados = obter_agregados(temporada=temporada or TODAS)
+
+    # Tabela colunar: uma linha por (competição, jogador), inclusive a competição "Todas"
+    tabela = pd.concat(
+        {competicao: totais[['PTS', 'GOL', 'ASS']] for competicao, totais in agregados.por_jogador.items()},
+        names=['COMPETIÇÃO']
+    ).reset_index()
+
+    # Contagens distintas não saem de somas por jogador: vão prontas por competição
+    contagens = {
+        competicao: {
+            'partidas': int(resumo['total_partidas']),
+            'rodadas': int(resumo['quantidade_rodadas'])
+        }
+        for competicao, resumo in agregados.resumos.items()
+    }
+
+    return {
+        'jogadores': {col: tabela[col].tolist() for col in ['COMPETIÇÃO', 'PLAYER', 'PTS', 'GOL', 'ASS']},
+        'contagens': contagens
+    }
+
+# Gráficos e cards recalculados no navegador a cada troca de filtro (assets/home_clientside.js)
+clientside_callback(
+    ClientsideFunction(namespace='home', function_name='atualizar_graficos'),
     Output('grafico-top5-pts', 'figure'),
     Output('grafico-top5-metrica', 'figure'),
     Output('total-partidas', 'children'),
     Output('primeiro-colocado', 'children'),
     Output('total-gols', 'children'),
     Output('quantidade-rodadas', 'children'),
+    Input('store-home', 'data'),
     Input('dropdown-competicao', 'value'),
     Input('dropdown-metrica', 'value')
 )
-def atualizar_graficos(competicao, metrica):
-
-    df_full = carregar_dados_google_sheets()
-
-    if competicao == "Todas":
-        df = df_full.copy()
-    else:
-        df = df_full[df_full['COMPETIÇÃO'] == competicao]
-
-    # Estatísticas
-    total_partidas = df['PARTIDA'].nunique()
-    total_gols = df['GOL'].sum()
-    quantidade_rodadas = df['RODADA'].nunique()
-
-    # Top 1 jogador
-    if df.empty:
-        top1 = "Sem dados"
-    else:
-        top1 = df.groupby('PLAYER')['PTS'].sum().sort_values(ascending=False).index[0]
-
-    # Gráfico Top 5 Pontos
-    top5_pts = df.groupby('PLAYER')['PTS'].sum().sort_values(ascending=False).head(5).reset_index()
-    fig_top5_pts = px.bar(
-        top5_pts, x='PTS', y='PLAYER',
-        orientation='h',
-        title=f"Top 5 Jogadores - Pontos ({competicao})",
-        labels={'PTS': 'Pontos', 'PLAYER': 'Jogador'},
-        template='plotly_white',
-        color_discrete_sequence=["#38003D"],
-        text_auto=True
-    )
-    fig_top5_pts.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font_color='#38003D',
-        title_font_size=20,
-        title_x=0.5,
-        xaxis_title=None,
-        yaxis_title=None,
-        xaxis=dict(title="Pontos", title_font_size=14)
-    )
-
-    # Gráfico Top 5 Métrica (GOL ou ASS)
-    top5_metrica = df.groupby('PLAYER')[metrica].sum().sort_values(ascending=False).head(5).reset_index()
-    fig_top5_metrica = px.bar(
-        top5_metrica, x=metrica, y='PLAYER',
-        orientation='h',
-        title=f"Top 5 Jogadores - {'Gols' if metrica == 'GOL' else 'Assistências'} ({competicao})",
-        labels={metrica: 'Quantidade', 'PLAYER': 'Jogador'},
-        template='plotly_white',
-        color_discrete_sequence=["#5D9231"],
-        text_auto=True
-    )
-    fig_top5_metrica.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font_color='#38003D',
-        title_font_size=20,
-        title_x=0.5,
-        xaxis_title=None,
-        yaxis_title=None,
-        xaxis=dict(title="Quantidade", title_font_size=14)
-    )
-
-    return fig_top5_pts, fig_top5_metrica, total_partidas, top1, total_gols, quantidade_rodadas
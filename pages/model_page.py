@@ -1,15 +1,6 @@
-from dash import dash, html, dcc, Output, Input, State, dash_table, callback, register_page
-import dash_bootstrap_components as dbc
-
-import pandas as pd
-import plotly as plt
-from datetime import date
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import dash_ag_grid as dag
-
-from src.globals import *
+from dash import html, register_page
+
+# Página modelo (sem conteúdo): só o necessário para registrá-la, sem importar plotly, dash_ag_grid nem src.globals
 
 
 # Dash
@@ -1,15 +1,34 @@
-from dash import html, dcc, register_page, Output, Input, callback
+from dash import html, dcc, register_page, Output, Input, State, callback, dash_table
 import dash_bootstrap_components as dbc
-import plotly.express as px
-from src.data_loader import carregar_dados_google_sheets
+from src.indices import obter_indice_jogadores
+from src.data_loader import obter_snapshot, fixar_snapshot, obter_temporadas, TODAS
+from src.linha_do_tempo import obter_linha_do_tempo, COMPETICAO_PADRAO
+from src.similaridade import obter_similaridade, K_SIMILARES
+from src.quimica import obter_quimica
+from src.cache_figuras import memoizar_por_snapshot
 import pandas as pd
 
 # Registrar a página
 register_page(__name__, path="/player_profile", name="Analítico por Jogador")
 
+# Parceiros na lista de melhores parceiros e no mapa de calor da química
+TOP_PARCEIROS = 5
+PARCEIROS_MAPA = 10
+
 # Layout
 layout = dbc.Container([
+    # Versão dos dados desta renderização (todos os callbacks da página leem a mesma)
+    dcc.Store(id='store-versao-perfil'),
+
     dbc.Row([
+        dbc.Col([
+            dcc.Dropdown(
+                id='dropdown-temporada-perfil',
+                options=[],  # Opções carregadas a partir das temporadas do snapshot
+                clearable=False,
+                style={"marginBottom": "20px"}
+            )
+        ], md=3),
         dbc.Col([
             dcc.Dropdown(
                 id='dropdown-jogador',
@@ -17,7 +36,7 @@ layout = dbc.Container([
                 placeholder="Selecione um jogador",
                 style={"marginBottom": "20px"}
             )
-        ], width=12)
+        ], md=9)
     ]),
 
     dbc.Row([
@@ -26,6 +45,23 @@ layout = dbc.Container([
         ], width=12)
     ]),
 
+    dbc.Row([
+        dbc.Col([
+            dcc.RadioItems(
+                id='competicao-trajetoria',
+                options=[
+                    {"label": "LIGA", "value": "LIGA"},
+                    {"label": "COPA", "value": "COPA"}
+                ],
+                value=COMPETICAO_PADRAO,
+                inline=True,
+                className="text-center",
+                inputStyle={"marginLeft": "15px", "marginRight": "5px"}
+            ),
+            dcc.Graph(id='grafico-trajetoria-jogador')
+        ], width=12)
+    ]),
+
     dbc.Row([
         dbc.Col([
             html.Div(id='cartoes-estatisticas', className="d-flex flex-wrap justify-content-center gap-3")
@@ -37,40 +73,111 @@ layout = dbc.Container([
             html.H4("Médias da Competição", className="text-center my-4", style={"color": "#38003D"}),
             html.Div(id='cartoes-medias', className="d-flex flex-wrap justify-content-center gap-3")
         ], width=12)
-    ])
+    ]),
+
+    dbc.Row([
+        dbc.Col([
+            html.H4("Jogadores Parecidos", className="text-center my-4", style={"color": "#38003D"}),
+            html.Div([
+                dcc.RadioItems(
+                    id='competicao-similares',
+                    options=[
+                        {"label": "Todas", "value": TODAS},
+                        {"label": "LIGA", "value": "LIGA"},
+                        {"label": "COPA", "value": "COPA"}
+                    ],
+                    value=TODAS,
+                    inline=True,
+                    inputStyle={"marginLeft": "15px", "marginRight": "5px"}
+                ),
+                dcc.Checklist(
+                    id='filtro-posicao-similares',
+                    options=[{"label": "Só a mesma posição", "value": "mesma"}],
+                    value=["mesma"],
+                    inline=True,
+                    inputStyle={"marginLeft": "15px", "marginRight": "5px"}
+                ),
+            ], className="d-flex justify-content-center flex-wrap mb-3"),
+            dash_table.DataTable(
+                id='tabela-similares',
+                columns=[{"name": nome, "id": nome} for nome in ["PLAYER", "POSIÇÃO", "PARTIDAS", "Similaridade"]],
+                style_cell={'textAlign': 'center', 'padding': '6px', 'fontFamily': 'Arial, sans-serif', 'fontSize': '14px'},
+                style_header={'backgroundColor': '#38003D', 'color': 'white', 'fontWeight': 'bold'},
+                style_data={'backgroundColor': 'white', 'color': '#38003D'}
+            )
+        ], md={"size": 8, "offset": 2}, className="mb-4")
+    ]),
+
+    dbc.Row([
+        dbc.Col([
+            html.H4("Química com os Companheiros", className="text-center my-4", style={"color": "#38003D"}),
+        ], width=12),
+        dbc.Col([
+            html.H6("Melhores parceiros", className="text-center fw-bold", style={"color": "#38003D"}),
+            dash_table.DataTable(
+                id='tabela-parceiros',
+                columns=[{"name": nome, "id": nome} for nome in ["PARCEIRO", "Partidas", "V", "E", "D", "Aproveitamento", "PTS por partida"]],
+                style_cell={'textAlign': 'center', 'padding': '6px', 'fontFamily': 'Arial, sans-serif', 'fontSize': '14px'},
+                style_header={'backgroundColor': '#38003D', 'color': 'white', 'fontWeight': 'bold'},
+                style_data={'backgroundColor': 'white', 'color': '#38003D'}
+            )
+        ], md=5),
+        dbc.Col([
+            dcc.Graph(id='grafico-quimica')
+        ], md=7)
+    ], className="mb-4")
 ], fluid=True)
 
+# Callback para carregar as temporadas disponíveis (a mais recente vem selecionada)
+@callback(
+    Output('dropdown-temporada-perfil', 'options'),
+    Output('dropdown-temporada-perfil', 'value'),
+    Output('store-versao-perfil', 'data'),
+    Input('dropdown-temporada-perfil', 'id')  # Dummy Input para carregar ao iniciar
+)
+def carregar_temporadas_perfil(_):
+    versao = obter_snapshot().impressao
+    temporadas = obter_temporadas()
+    options = [{"label": "Todas", "value": TODAS}] + [{"label": temporada, "value": temporada} for temporada in temporadas]
+    return options, temporadas[-1] if temporadas else TODAS, versao
+
 # Callback para carregar as opções do dropdown
 @callback(
     Output('dropdown-jogador', 'options'),
-    Input('dropdown-jogador', 'id')  # Dummy Input para carregar ao iniciar
+    Input('dropdown-temporada-perfil', 'value'),
+    State('store-versao-perfil', 'data')
 )
-def carregar_dropdown_jogadores(_):
-    df_full = carregar_dados_google_sheets()
-    jogadores = sorted(df_full['PLAYER'].unique())
-    options = [{"label": jogador, "value": jogador} for jogador in jogadores]
-    return options
+@fixar_snapshot
+def carregar_dropdown_jogadores(temporada):
+    # Lista já ordenada e montada uma vez por snapshot e temporada
+    return obter_indice_jogadores(temporada=temporada or TODAS).opcoes_dropdown
 
 # Callback principal para atualizar gráfico e cards
 @callback(
     Output('grafico-pontos-rodada', 'figure'),
     Output('cartoes-estatisticas', 'children'),
     Output('cartoes-medias', 'children'),
-    Input('dropdown-jogador', 'value')
+    Input('dropdown-temporada-perfil', 'value'),
+    Input('dropdown-jogador', 'value'),
+    State('store-versao-perfil', 'data')
 )
-def atualizar_perfil(jogador):
-    df_full = carregar_dados_google_sheets()
+@fixar_snapshot
+@memoizar_por_snapshot
+def atualizar_perfil(temporada, jogador):
+    # Importado no primeiro uso: o plotly.express pesa na inicialização do app
+    import plotly.express as px
 
     if jogador is None:
         return {}, [], []
 
-    df_jogador = df_full[df_full['PLAYER'] == jogador]
-
-    # 🎯 Agrupamento de pontos por rodada
-    df_agrupado = df_jogador.groupby('RODADA')['PTS'].sum().reset_index()
+    indice = obter_indice_jogadores(temporada=temporada or TODAS)
+    perfil = indice.perfis.get(jogador)
+    if perfil is None:
+        return {}, [], []
 
+    # 🎯 Pontos por rodada (já somados no índice)
     fig = px.line(
-        df_agrupado,
+        perfil.pts_por_rodada,
         x='RODADA',
         y='PTS',
         title=f"Pontos por Rodada - {jogador}",
@@ -85,20 +192,10 @@ def atualizar_perfil(jogador):
     )
 
     # Estatísticas agregadas do jogador
-    stats = df_jogador.agg({
-        'GOL': 'sum',
-        'ASS': 'sum',
-        'V': 'sum',
-        'E': 'sum',
-        'D': 'sum',
-        'STG': 'sum',
-        'GS': 'sum',
-        'DD': 'sum',
-        'DP': 'sum'
-    }).to_dict()
+    stats = perfil.totais
 
     # Detecta se é Goleiro (GK)
-    posicao = df_jogador['POSIÇÃO'].iloc[0]
+    posicao = perfil.posicao
     cartoes = []
 
     cartoes.extend([
@@ -118,14 +215,7 @@ def atualizar_perfil(jogador):
         ])
 
     # Médias da competição
-    medias = df_full.groupby('PLAYER').agg({
-        'GOL': 'sum',
-        'ASS': 'sum',
-        'V': 'sum',
-        'E': 'sum',
-        'D': 'sum',
-        'STG': 'sum'
-    }).mean().round(2).to_dict()
+    medias = indice.medias
 
     cartoes_medias = [
         criar_cartao(f"Média de Gols", medias['GOL']),
@@ -138,6 +228,110 @@ def atualizar_perfil(jogador):
 
     return fig, cartoes, cartoes_medias
 
+# Callback da trajetória do jogador na classificação (colocação e PTS acumulados rodada a rodada)
+@callback(
+    Output('grafico-trajetoria-jogador', 'figure'),
+    Input('dropdown-temporada-perfil', 'value'),
+    Input('dropdown-jogador', 'value'),
+    Input('competicao-trajetoria', 'value'),
+    State('store-versao-perfil', 'data')
+)
+@fixar_snapshot
+@memoizar_por_snapshot
+def atualizar_trajetoria(temporada, jogador, competicao):
+    from plotly.subplots import make_subplots
+
+    if jogador is None:
+        return {}
+
+    trajetoria = obter_linha_do_tempo(temporada=temporada or TODAS).trajetoria(competicao, jogador)
+
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig.add_bar(x=trajetoria['RODADA'], y=trajetoria['PTS'], name="PTS acumulados", marker_color="#BDE79A", secondary_y=False)
+    fig.add_scatter(x=trajetoria['RODADA'], y=trajetoria['Colocação'], name="Colocação", mode="lines+markers",
+                    line_color="#38003D", secondary_y=True)
+    fig.update_yaxes(title_text="PTS acumulados", secondary_y=False)
+    # Colocação 1 no topo
+    fig.update_yaxes(title_text="Colocação", autorange="reversed", secondary_y=True)
+    fig.update_layout(
+        title=f"Trajetória na classificação ({competicao}) - {jogador}",
+        template='plotly_white',
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font_color='#38003D',
+        title_x=0.5,
+        xaxis_title="RODADA"
+    )
+    return fig
+
+# Callback dos jogadores de perfil mais parecido (médias por partida padronizadas, vizinhos mais próximos)
+@callback(
+    Output('tabela-similares', 'data'),
+    Input('dropdown-temporada-perfil', 'value'),
+    Input('dropdown-jogador', 'value'),
+    Input('competicao-similares', 'value'),
+    Input('filtro-posicao-similares', 'value'),
+    State('store-versao-perfil', 'data')
+)
+@fixar_snapshot
+@memoizar_por_snapshot
+def atualizar_similares(temporada, jogador, competicao, filtro_posicao):
+    if jogador is None:
+        return []
+
+    similares = obter_similaridade(temporada=temporada or TODAS).similares(
+        jogador, competicao or TODAS, K_SIMILARES, mesma_posicao='mesma' in (filtro_posicao or [])
+    )
+    similares = similares.assign(Similaridade=similares['Similaridade'].map(lambda valor: f"{valor:.0f}%"))
+    return similares[["PLAYER", "POSIÇÃO", "PARTIDAS", "Similaridade"]].to_dict('records')
+
+# Callback da química: melhores parceiros e mapa de calor do aproveitamento juntos
+@callback(
+    Output('tabela-parceiros', 'data'),
+    Output('grafico-quimica', 'figure'),
+    Input('dropdown-temporada-perfil', 'value'),
+    Input('dropdown-jogador', 'value'),
+    State('store-versao-perfil', 'data')
+)
+@fixar_snapshot
+@memoizar_por_snapshot
+def atualizar_quimica(temporada, jogador):
+    # Importado no primeiro uso: o plotly.express pesa na inicialização do app
+    import plotly.express as px
+
+    if jogador is None:
+        return [], {}
+
+    quimica = obter_quimica(temporada=temporada or TODAS)
+    parceiros = quimica.parceiros(jogador)
+
+    melhores = parceiros.head(TOP_PARCEIROS)
+    melhores = melhores.assign(Aproveitamento=melhores['Aproveitamento'].map(lambda valor: f"{valor:.0f}%"))
+
+    # Mapa de calor entre o jogador e os parceiros com quem mais jogou
+    frequentes = parceiros.nlargest(PARCEIROS_MAPA, 'Partidas')['PARCEIRO'].tolist()
+    mapa = quimica.aproveitamento_entre([jogador] + frequentes)
+    fig = px.imshow(
+        mapa,
+        text_auto='.0f',
+        zmin=0,
+        zmax=100,
+        color_continuous_scale=["#FF5C5C", "#F8F9FA", "#5D9231"],
+        labels={"color": "Aproveitamento (%)"},
+        title=f"Aproveitamento jogando juntos (%) - {jogador} e parceiros frequentes",
+        template='plotly_white'
+    )
+    fig.update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font_color='#38003D',
+        title_x=0.5,
+        xaxis_title=None,
+        yaxis_title=None
+    )
+
+    return melhores.to_dict('records'), fig
+
 # Função para criar cartões de estatísticas
 def criar_cartao(titulo, valor):
     return dbc.Card([
@@ -1,17 +1,66 @@
-from dash import html, dcc, register_page, Output, Input, callback
+import re
+from dash import html, dcc, register_page, Output, Input, State, callback, ctx, no_update
 import dash_bootstrap_components as dbc
 from dash import dash_table
-from src.data_loader import carregar_dados_google_sheets
+from dash.exceptions import MissingCallbackContextException
 import pandas as pd
+from src.agregados import obter_agregados, TODAS
+from src.data_loader import obter_snapshot, fixar_snapshot, obter_temporadas
+from src.linha_do_tempo import obter_linha_do_tempo, COMPETICAO_PADRAO
+from src.cache_figuras import memoizar_por_snapshot
 
 # Registrar esta página
 register_page(__name__, path="/player_ranking", name="Ranking de Jogadores")
 
 # Layout
 layout = dbc.Container([
+    # Versão dos dados desta renderização (todos os callbacks da página leem a mesma)
+    dcc.Store(id='store-versao-ranking'),
+
     dbc.Row([
         dbc.Col([
             html.H5("Ranking Geral", className="text-center my-4", style={"color": "#38003D"}),
+        ])
+    ]),
+
+    # Filtros
+    dbc.Row([
+        dbc.Col([
+            html.Label("Temporada:", className="mb-2 fw-bold", style={"color": "#38003D"}),
+            dcc.Dropdown(
+                id='dropdown-temporada-ranking',
+                options=[],  # Opções carregadas a partir das temporadas do snapshot
+                clearable=False
+            )
+        ], md=3),
+        dbc.Col([
+            html.Label("Competição:", className="mb-2 fw-bold", style={"color": "#38003D"}),
+            dcc.Dropdown(
+                id='dropdown-competicao-ranking',
+                options=[
+                    {"label": "Todas", "value": TODAS},
+                    {"label": "LIGA", "value": "LIGA"},
+                    {"label": "COPA", "value": "COPA"}
+                ],
+                value=TODAS,
+                clearable=False
+            )
+        ], md=3),
+        dbc.Col([
+            html.Label("Função:", className="mb-2 fw-bold", style={"color": "#38003D"}),
+            dcc.Dropdown(
+                id='dropdown-posicao-ranking',
+                options=[{"label": "Todas", "value": TODAS}] + [
+                    {"label": posicao, "value": posicao} for posicao in ['GK', 'ZAG', 'MEI', 'ATA']
+                ],
+                value=TODAS,
+                clearable=False
+            )
+        ], md=3)
+    ], className="mb-3"),
+
+    dbc.Row([
+        dbc.Col([
             dash_table.DataTable(
                 id='tabela-ranking',
                 columns=[
@@ -48,9 +97,15 @@ layout = dbc.Container([
                     'overflowX': 'auto',
                     'border': '1px solid #E6E6E6'
                 },
+                # Paginação, ordenação e filtro feitos no servidor: só a página visível trafega
+                page_action="custom",
+                page_current=0,
                 page_size=25,
-                sort_action="native",
+                sort_action="custom",
                 sort_mode="multi",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
                 style_data_conditional=[
                     {
                         'if': {'filter_query': '{Posição} = 1'},
@@ -73,38 +128,163 @@ layout = dbc.Container([
                 ]
             )
         ])
-    ])
+    ]),
+
+    # Evolução da classificação rodada a rodada
+    dbc.Row([
+        dbc.Col([
+            dcc.Graph(id='grafico-evolucao-ranking')
+        ])
+    ], className="my-4")
 ], fluid=True)
 
-# Callback para carregar a tabela
+# Quantidade de jogadores no gráfico de evolução da classificação
+TOP_EVOLUCAO = 10
+
+# Operadores da sintaxe de filtro do DataTable: símbolo -> nome usado em filtrar (ex.: ">=" -> "ge")
+OPERADORES_FILTRO = {
+    'ge': 'ge', '>=': 'ge', 'le': 'le', '<=': 'le', 'lt': 'lt', '<': 'lt', 'gt': 'gt', '>': 'gt',
+    'ne': 'ne', '!=': 'ne', 'eq': 'eq', '=': 'eq', 'contains': 'contains', 'datestartswith': 'datestartswith'
+}
+
+# "{coluna} operador valor": o operador só é procurado logo depois do "}" da coluna, nunca dentro do valor
+PADRAO_FILTRO = re.compile(
+    r'^\s*\{(.+?)\}\s+(' + '|'.join(re.escape(op) for op in sorted(OPERADORES_FILTRO, key=len, reverse=True)) + r')\s+(.*)$'
+)
+
+# Propriedades da tabela que só mudam de página (as demais voltam para a primeira página)
+NAVEGACAO_TABELA = {'tabela-ranking.page_current', 'tabela-ranking.page_size'}
+
+# Callback para carregar as temporadas disponíveis (a mais recente vem selecionada)
+@callback(
+    Output('dropdown-temporada-ranking', 'options'),
+    Output('dropdown-temporada-ranking', 'value'),
+    Output('store-versao-ranking', 'data'),
+    Input('dropdown-temporada-ranking', 'id')  # Dummy Input para carregar ao iniciar
+)
+def carregar_temporadas_ranking(_):
+    versao = obter_snapshot().impressao
+    temporadas = obter_temporadas()
+    options = [{"label": "Todas", "value": TODAS}] + [{"label": temporada, "value": temporada} for temporada in temporadas]
+    return options, temporadas[-1] if temporadas else TODAS, versao
+
+# Callback para carregar a página visível da tabela
 @callback(
     Output('tabela-ranking', 'data'),
-    Input('tabela-ranking', 'id')  # Dummy Input só para ativar o callback no carregamento
+    Output('tabela-ranking', 'page_count'),
+    Output('tabela-ranking', 'page_current'),
+    Input('dropdown-temporada-ranking', 'value'),
+    Input('dropdown-competicao-ranking', 'value'),
+    Input('dropdown-posicao-ranking', 'value'),
+    Input('tabela-ranking', 'page_current'),
+    Input('tabela-ranking', 'page_size'),
+    Input('tabela-ranking', 'sort_by'),
+    Input('tabela-ranking', 'filter_query'),
+    State('store-versao-ranking', 'data')
+)
+@fixar_snapshot
+def carregar_tabela(temporada, competicao, posicao, page_current, page_size, sort_by, filter_query):
+    # Ranking pré-calculado uma vez por snapshot e temporada (a colocação é a da competição, antes dos filtros)
+    df_ranking = obter_agregados(temporada=temporada or TODAS).ranking(competicao)
+
+    if posicao and posicao != TODAS:
+        df_ranking = df_ranking[df_ranking['POSIÇÃO'] == posicao]
+
+    df_ranking = filtrar(df_ranking, filter_query)
+
+    if sort_by:
+        df_ranking = df_ranking.sort_values(
+            [coluna['column_id'] for coluna in sort_by],
+            ascending=[coluna['direction'] == 'asc' for coluna in sort_by]
+        )
+
+    # Troca de temporada, competição, posição, ordenação ou filtro volta para a primeira página
+    try:
+        disparos = set(ctx.triggered_prop_ids)
+    except MissingCallbackContextException:
+        # Chamada direta, fora de uma requisição do Dash (ex.: benchmarks)
+        disparos = set()
+    reiniciar = bool(disparos - NAVEGACAO_TABELA)
+    page_current = 0 if reiniciar else (page_current or 0)
+
+    total_paginas = max(1, -(-len(df_ranking) // page_size))
+    pagina = df_ranking.iloc[page_current * page_size:(page_current + 1) * page_size]
+
+    return pagina.to_dict('records'), total_paginas, 0 if reiniciar else no_update
+
+
+# Callback da evolução da classificação dos primeiros colocados
+@callback(
+    Output('grafico-evolucao-ranking', 'figure'),
+    Input('dropdown-temporada-ranking', 'value'),
+    Input('dropdown-competicao-ranking', 'value'),
+    State('store-versao-ranking', 'data')
 )
-def carregar_tabela(_):
-    df_full = carregar_dados_google_sheets()
+@fixar_snapshot
+@memoizar_por_snapshot
+def atualizar_evolucao(temporada, competicao):
+    # Importado no primeiro uso: o plotly.express pesa na inicialização do app
+    import plotly.express as px
+
+    # Rodadas só se comparam dentro de uma competição: "Todas" mostra a LIGA
+    competicao = competicao if competicao and competicao != TODAS else COMPETICAO_PADRAO
+    evolucao = obter_linha_do_tempo(temporada=temporada or TODAS).evolucao(competicao, TOP_EVOLUCAO)
+
+    fig = px.line(
+        evolucao, x='RODADA', y='Colocação', color='PLAYER',
+        markers=True,
+        hover_data=['PTS'],
+        title=f"Evolução da classificação - Top {TOP_EVOLUCAO} ({competicao})",
+        template='plotly_white'
+    )
+    fig.update_yaxes(autorange="reversed")
+    fig.update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font_color='#38003D',
+        title_x=0.5
+    )
+    return fig
+
+def filtrar(df: pd.DataFrame, filter_query: str) -> pd.DataFrame:
+    """
+    Aplica o filter_query do DataTable (ex.: "{PTS} > 50 && {PLAYER} contains Ana") ao DataFrame.
+    """
+    for parte in (filter_query or '').split(' && '):
+        coluna, operador, valor = separar_filtro(parte)
+        if coluna not in df.columns:
+            continue
 
-    # Número de partidas jogadas (considera 1 linha = 1 jogo por jogador)
-    partidas_jogadas = df_full.groupby('PLAYER').size().reset_index(name='PARTIDAS')
+        if operador in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+            serie = df[coluna]
+            if isinstance(valor, str) and pd.api.types.is_numeric_dtype(serie):
+                valor = pd.to_numeric(valor, errors='coerce')
+            df = df.loc[getattr(serie, operador)(valor)]
+        elif operador == 'contains':
+            df = df.loc[df[coluna].astype(str).str.contains(str(valor), case=False, regex=False)]
+        elif operador == 'datestartswith':
+            df = df.loc[df[coluna].astype(str).str.startswith(str(valor))]
 
-    # Agrupar somas de estatísticas por jogador
-    df_ranking = df_full.groupby(['PLAYER', 'POSIÇÃO']).agg({
-        'V': 'sum',
-        'E': 'sum',
-        'D': 'sum',
-        'STG': 'sum',
-        'GOL': 'sum',
-        'ASS': 'sum',
-        'PTS': 'sum'
-    }).reset_index()
+    return df
 
-    # Merge para incluir a quantidade de partidas
-    df_ranking = df_ranking.merge(partidas_jogadas, on='PLAYER', how='left')
 
-    # Ordenar pela pontuação de forma decrescente
-    df_ranking = df_ranking.sort_values(by='PTS', ascending=False).reset_index(drop=True)
+def separar_filtro(parte: str):
+    """
+    Separa um trecho do filter_query em (coluna, operador, valor); retorna (None, None, None) se não reconhecer.
+    """
+    encontrado = PADRAO_FILTRO.match(parte)
+    if encontrado is None:
+        return None, None, None
+    nome, operador, valor = encontrado.groups()
 
-    # Criar uma coluna de posição no ranking
-    df_ranking.insert(0, 'Posição', df_ranking.index + 1)
+    valor = valor.strip()
+    if len(valor) >= 2 and valor[0] == valor[-1] and valor[0] in ("'", '"', '`'):
+        valor = valor[1:-1].replace('\\' + valor[0], valor[0])
+    else:
+        try:
+            valor = float(valor)
+        except ValueError:
+            pass
 
-    return df_ranking.to_dict('records')
+    # Os operadores de palavra e de símbolo são tratados pelo mesmo nome (ex.: "ge")
+    return nome, OPERADORES_FILTRO[operador], valor
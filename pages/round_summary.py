@@ -1,22 +1,32 @@
-from dash import html, dcc, register_page, Output, Input, callback
+from dash import html, dcc, register_page, Output, Input, State, callback
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import pandas as pd
-from src.data_loader import carregar_dados_google_sheets
+from src.indices import obter_indice_rodadas, CRITERIOS_RODADA
+from src.data_loader import obter_snapshot, fixar_snapshot, obter_temporadas, TODAS
+from src.cache_figuras import memoizar_por_snapshot
 
 # Registrar esta página
 register_page(__name__, path="/round_summary", name="Resumo da Rodada")
 
 # Lista de critérios disponíveis
-criterios_disponiveis = ['GOL', 'ASS', 'FALTA', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP']
+criterios_disponiveis = CRITERIOS_RODADA
 
 # Layout
 layout = dbc.Container([
+    # Versão dos dados desta renderização (todos os callbacks da página leem a mesma)
+    dcc.Store(id='store-versao-round'),
+
     # PRIMEIRA ROW: Filtros + Gráfico V/E/D
     dbc.Row([
         # Coluna de filtros
         dbc.Col([
             html.Div([
+                html.Label("Temporada:", className="fw-bold", style={"color": "#38003D"}),
+                dcc.Dropdown(
+                    id='dropdown-temporada-round',
+                    options=[],  # Opções carregadas a partir das temporadas do snapshot
+                    clearable=False,
+                    style={"marginBottom": "20px"}
+                ),
                 html.Label("Competição:", className="fw-bold", style={"color": "#38003D"}),
                 dcc.RadioItems(
                     id='competicao-round',
@@ -61,16 +71,32 @@ layout = dbc.Container([
     ])
 ], fluid=True)
 
+# Callback para carregar as temporadas disponíveis
+# (rodadas só fazem sentido dentro de uma temporada: "Todas" só aparece quando a fonte não separa temporadas)
+@callback(
+    Output('dropdown-temporada-round', 'options'),
+    Output('dropdown-temporada-round', 'value'),
+    Output('store-versao-round', 'data'),
+    Input('dropdown-temporada-round', 'id')  # Dummy Input para carregar ao iniciar
+)
+def carregar_temporadas_round(_):
+    versao = obter_snapshot().impressao
+    temporadas = obter_temporadas()
+    if not temporadas:
+        return [{"label": "Todas", "value": TODAS}], TODAS, versao
+    return [{"label": temporada, "value": temporada} for temporada in temporadas], temporadas[-1], versao
+
 # Callback para preencher rodadas disponíveis
 @callback(
     Output('dropdown-rodada-round', 'options'),
     Output('dropdown-rodada-round', 'value'),
-    Input('competicao-round', 'value')
+    Input('dropdown-temporada-round', 'value'),
+    Input('competicao-round', 'value'),
+    State('store-versao-round', 'data')
 )
-def atualizar_rodadas(competicao):
-    df_full = carregar_dados_google_sheets()
-    df = df_full[df_full['COMPETIÇÃO'] == competicao]
-    rodadas = sorted(df['RODADA'].unique())
+@fixar_snapshot
+def atualizar_rodadas(temporada, competicao):
+    rodadas = obter_indice_rodadas(temporada=temporada or TODAS).rodadas.get(competicao, [])
     options = [{"label": str(rodada), "value": rodada} for rodada in rodadas]
     value = rodadas[0] if rodadas else None
     return options, value
@@ -79,24 +105,28 @@ def atualizar_rodadas(competicao):
 @callback(
     Output('grafico-ved-round', 'figure'),
     Output('grafico-criterio-round', 'figure'),
+    Input('dropdown-temporada-round', 'value'),
     Input('competicao-round', 'value'),
     Input('dropdown-rodada-round', 'value'),
-    Input('dropdown-criterio-round', 'value')
+    Input('dropdown-criterio-round', 'value'),
+    State('store-versao-round', 'data')
 )
-def atualizar_graficos_round(competicao, rodada, criterio):
+@fixar_snapshot
+@memoizar_por_snapshot
+def atualizar_graficos_round(temporada, competicao, rodada, criterio):
+    # Importado no primeiro uso: o plotly.express pesa na inicialização do app
+    import plotly.express as px
+
     if rodada is None:
         return {}, {}
 
-    df_full = carregar_dados_google_sheets()
-    df = df_full[(df_full['COMPETIÇÃO'] == competicao) & (df_full['RODADA'] == str(rodada))]
-
-    # Gráfico V/E/D por Time
-    ved_data = df.groupby(['TIME', 'PARTIDA'])[['V', 'E', 'D']].max().reset_index()
-    ved_data = ved_data.groupby('TIME')[['V', 'E', 'D']].sum().reset_index()
-    ved_data = ved_data.melt(id_vars='TIME', value_vars=['V', 'E', 'D'], var_name='Resultado', value_name='Quantidade')
+    particao = obter_indice_rodadas(temporada=temporada or TODAS).particao(competicao, rodada)
+    if particao is None:
+        return {}, {}
 
+    # Gráfico V/E/D por Time (já somado na partição da rodada)
     fig_ved = px.bar(
-        ved_data, x='TIME', y='Quantidade', color='Resultado',
+        particao.ved, x='TIME', y='Quantidade', color='Resultado',
         color_discrete_map={
             "V": "#5D9231",     # Verde suave (Vitória)
             "E": "#BDA65E",     # Dourado opaco (Empate)
@@ -126,11 +156,8 @@ def atualizar_graficos_round(competicao, rodada, criterio):
     )
 
     # Gráfico Critério selecionado
-    criterio_data = df.groupby('PLAYER')[criterio].sum().reset_index()
-    criterio_data = criterio_data[criterio_data[criterio] > 0]
-
     fig_criterio = px.bar(
-        criterio_data, x=criterio, y='PLAYER',
+        particao.criterio(criterio), x=criterio, y='PLAYER',
         orientation='h',
         title=f"{criterio} - Rodada {rodada} ({competicao})",
         template='plotly_white',
@@ -0,0 +1,214 @@
+from dash import html, dcc, register_page, Output, Input, State, callback, ctx, dash_table
+import dash_bootstrap_components as dbc
+import pandas as pd
+from src.agregados import obter_agregados, TODAS
+from src.data_loader import obter_snapshot, fixar_snapshot, obter_temporadas, CRITERIOS
+from src.pontuacao import simular_cenarios
+from src.cache_figuras import memoizar_por_snapshot
+
+# Registrar esta página
+register_page(__name__, path="/simulador", name="Simulador de Pontuação")
+
+# Posições e estatísticas da tabela de pesos (as mesmas dos critérios atuais)
+POSICOES = list(CRITERIOS)
+ESTATISTICAS = list(dict.fromkeys(col for pesos in CRITERIOS.values() for col in pesos))
+
+# Linhas da tabela de pesos com os critérios atuais (uma por critério)
+PESOS_ATUAIS = [
+    {"CRITÉRIO": col, **{posicao: CRITERIOS[posicao].get(col, 0) for posicao in POSICOES}}
+    for col in ESTATISTICAS
+]
+
+# Cenário montado na tabela de pesos (sempre simulado, mesmo sem ser salvo)
+CENARIO_EDITADO = "Editado"
+
+# Quantidade de jogadores no gráfico de maiores mudanças de colocação
+TOP_VARIACAO = 15
+
+# Layout
+layout = dbc.Container([
+    # Versão dos dados desta renderização (todos os callbacks da página leem a mesma)
+    dcc.Store(id='store-versao-simulador'),
+
+    dbc.Row([
+        dbc.Col([
+            html.H5("Simulador de Pontuação", className="text-center my-4", style={"color": "#38003D"}),
+        ])
+    ]),
+
+    dbc.Row([
+        # Coluna dos pesos e dos cenários salvos
+        dbc.Col([
+            html.Div([
+                html.Label("Temporada:", className="fw-bold", style={"color": "#38003D"}),
+                dcc.Dropdown(id='dropdown-temporada-simulador', options=[], clearable=False, style={"marginBottom": "10px"}),
+                html.Label("Competição:", className="fw-bold", style={"color": "#38003D"}),
+                dcc.Dropdown(
+                    id='dropdown-competicao-simulador',
+                    options=[
+                        {"label": "Todas", "value": TODAS},
+                        {"label": "LIGA", "value": "LIGA"},
+                        {"label": "COPA", "value": "COPA"}
+                    ],
+                    value=TODAS,
+                    clearable=False,
+                    style={"marginBottom": "10px"}
+                ),
+                html.Label("Pesos por posição (edite as células):", className="fw-bold", style={"color": "#38003D"}),
+                dash_table.DataTable(
+                    id='tabela-pesos-simulador',
+                    columns=[{"name": "Critério", "id": "CRITÉRIO", "editable": False}] + [
+                        {"name": posicao, "id": posicao, "type": "numeric", "editable": True} for posicao in POSICOES
+                    ],
+                    data=PESOS_ATUAIS,
+                    style_cell={'textAlign': 'center', 'padding': '4px', 'fontFamily': 'Arial, sans-serif', 'fontSize': '14px'},
+                    style_header={'backgroundColor': '#38003D', 'color': 'white', 'fontWeight': 'bold'},
+                    style_data={'backgroundColor': 'white', 'color': '#38003D'}
+                ),
+                dbc.InputGroup([
+                    dbc.Input(id='nome-cenario-simulador', placeholder="Nome do cenário"),
+                    dbc.Button("Salvar cenário", id='botao-salvar-simulador', color="success"),
+                    dbc.Button("Limpar", id='botao-limpar-simulador', color="secondary", outline=True),
+                ], className="my-3"),
+                dcc.Store(id='store-cenarios-simulador', data={}),
+            ], style={"padding": "10px", "backgroundColor": "#F8F9FA", "borderRadius": "10px"})
+        ], md=4),
+
+        # Coluna dos resultados
+        dbc.Col([
+            html.Label("Comparar cenário:", className="fw-bold", style={"color": "#38003D"}),
+            dcc.Dropdown(id='dropdown-cenario-simulador', options=[], value=CENARIO_EDITADO, clearable=False),
+            dash_table.DataTable(
+                id='tabela-resumo-simulador',
+                columns=[{"name": nome, "id": nome} for nome in ["Cenário", "1° Colocado", "Jogadores que mudaram de posição"]],
+                style_cell={'textAlign': 'center', 'padding': '6px', 'fontFamily': 'Arial, sans-serif', 'fontSize': '14px'},
+                style_header={'backgroundColor': '#38003D', 'color': 'white', 'fontWeight': 'bold'},
+                style_table={'marginTop': '15px'}
+            ),
+            dcc.Graph(id='grafico-variacao-simulador'),
+            dash_table.DataTable(
+                id='tabela-classificacao-simulador',
+                columns=[{"name": nome, "id": nome} for nome in ["Colocação", "PLAYER", "PTS", "Colocação atual", "PTS atual", "Variação"]],
+                page_size=20,
+                sort_action="native",
+                style_cell={'textAlign': 'center', 'padding': '6px', 'fontFamily': 'Arial, sans-serif', 'fontSize': '14px'},
+                style_header={'backgroundColor': '#38003D', 'color': 'white', 'fontWeight': 'bold'},
+                style_data={'backgroundColor': 'white', 'color': '#38003D'},
+                style_data_conditional=[
+                    {'if': {'filter_query': '{Variação} > 0', 'column_id': 'Variação'}, 'color': '#5D9231', 'fontWeight': 'bold'},
+                    {'if': {'filter_query': '{Variação} < 0', 'column_id': 'Variação'}, 'color': '#FF5C5C', 'fontWeight': 'bold'}
+                ]
+            )
+        ], md=8)
+    ], className="my-2")
+], fluid=True)
+
+# Callback para carregar as temporadas disponíveis (a mais recente vem selecionada)
+@callback(
+    Output('dropdown-temporada-simulador', 'options'),
+    Output('dropdown-temporada-simulador', 'value'),
+    Output('store-versao-simulador', 'data'),
+    Input('dropdown-temporada-simulador', 'id')  # Dummy Input para carregar ao iniciar
+)
+def carregar_temporadas_simulador(_):
+    versao = obter_snapshot().impressao
+    temporadas = obter_temporadas()
+    options = [{"label": "Todas", "value": TODAS}] + [{"label": temporada, "value": temporada} for temporada in temporadas]
+    return options, temporadas[-1] if temporadas else TODAS, versao
+
+# Callback para salvar o cenário da tabela de pesos (ou limpar os cenários salvos)
+@callback(
+    Output('store-cenarios-simulador', 'data'),
+    Input('botao-salvar-simulador', 'n_clicks'),
+    Input('botao-limpar-simulador', 'n_clicks'),
+    State('nome-cenario-simulador', 'value'),
+    State('tabela-pesos-simulador', 'data'),
+    State('store-cenarios-simulador', 'data'),
+    prevent_initial_call=True
+)
+def salvar_cenario(_salvar, _limpar, nome, pesos, cenarios):
+    if ctx.triggered_id == 'botao-limpar-simulador':
+        return {}
+    cenarios = dict(cenarios or {})
+    nome = (nome or "").strip() or f"Cenário {len(cenarios) + 1}"
+    cenarios[nome] = criterios_da_tabela(pesos)
+    return cenarios
+
+# Callback para listar os cenários disponíveis na comparação
+@callback(
+    Output('dropdown-cenario-simulador', 'options'),
+    Output('dropdown-cenario-simulador', 'value'),
+    Input('store-cenarios-simulador', 'data'),
+    State('dropdown-cenario-simulador', 'value')
+)
+def listar_cenarios(cenarios, selecionado):
+    nomes = [CENARIO_EDITADO] + list(cenarios or {})
+    return [{"label": nome, "value": nome} for nome in nomes], selecionado if selecionado in nomes else CENARIO_EDITADO
+
+# Callback principal: simula todos os cenários de uma vez e mostra o escolhido
+@callback(
+    Output('tabela-resumo-simulador', 'data'),
+    Output('grafico-variacao-simulador', 'figure'),
+    Output('tabela-classificacao-simulador', 'data'),
+    Input('dropdown-temporada-simulador', 'value'),
+    Input('dropdown-competicao-simulador', 'value'),
+    Input('tabela-pesos-simulador', 'data'),
+    Input('store-cenarios-simulador', 'data'),
+    Input('dropdown-cenario-simulador', 'value'),
+    State('store-versao-simulador', 'data')
+)
+@fixar_snapshot
+@memoizar_por_snapshot
+def simular(temporada, competicao, pesos, cenarios, selecionado):
+    # Importado no primeiro uso: o plotly.express pesa na inicialização do app
+    import plotly.express as px
+
+    # Totais por (COMPETIÇÃO, PLAYER, POSIÇÃO) já somados no snapshot: a simulação não passa pelas linhas brutas
+    totais = obter_agregados(temporada=temporada or TODAS).totais
+    if competicao and competicao != TODAS:
+        totais = totais[totais['COMPETIÇÃO'] == competicao]
+
+    todos = {CENARIO_EDITADO: criterios_da_tabela(pesos), **(cenarios or {})}
+    resultados = simular_cenarios(totais, todos, CRITERIOS)
+
+    resumo = [
+        {
+            "Cenário": nome,
+            "1° Colocado": classificacao['PLAYER'].iloc[0] if len(classificacao) else "Sem dados",
+            "Jogadores que mudaram de posição": int((classificacao['Variação'] != 0).sum())
+        }
+        for nome, classificacao in resultados.items()
+    ]
+
+    classificacao = resultados.get(selecionado, resultados[CENARIO_EDITADO])
+    maiores = classificacao.loc[classificacao['Variação'].abs().sort_values(ascending=False).index[:TOP_VARIACAO]]
+    maiores = maiores[maiores['Variação'] != 0].sort_values('Variação')
+
+    fig = px.bar(
+        maiores, x='Variação', y='PLAYER',
+        orientation='h',
+        color=maiores['Variação'] > 0,
+        color_discrete_map={True: "#5D9231", False: "#FF5C5C"},
+        title=f"Maiores mudanças de colocação - {selecionado}",
+        template='plotly_white',
+        text_auto=True
+    )
+    fig.update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font_color='#38003D',
+        title_x=0.5,
+        yaxis_title=None,
+        showlegend=False
+    )
+
+    return resumo, fig, classificacao.round(1).to_dict('records')
+
+
+def criterios_da_tabela(pesos: list) -> dict:
+    """
+    Converte as linhas da tabela de pesos (uma por critério) no formato de CRITERIOS; célula inválida vale 0.
+    """
+    tabela = pd.DataFrame(pesos).set_index('CRITÉRIO')
+    tabela = tabela.apply(pd.to_numeric, errors='coerce').fillna(0)
+    return {posicao: {col: float(peso) for col, peso in tabela[posicao].items()} for posicao in POSICOES if posicao in tabela.columns}
@@ -0,0 +1,158 @@
+from dataclasses import dataclass
+import pandas as pd
+from src.data_loader import obter_snapshot, registrar_derivado_incremental, TODAS
+
+# Estatísticas somadas nas tabelas agregadas (FALTA pode não existir na planilha)
+COLUNAS_ESTATISTICAS = ['V', 'E', 'D', 'GOL', 'ASS', 'STG', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP', 'FALTA', 'PTS']
+COLUNAS_CHAVE = ['COMPETIÇÃO', 'RODADA', 'PARTIDA', 'PLAYER', 'POSIÇÃO', 'TIME']
+COLUNAS_RANKING = ['V', 'E', 'D', 'STG', 'GOL', 'ASS', 'PTS']
+
+
+@dataclass
+class Agregados:
+    """
+    Tabelas agregadas calculadas uma única vez por snapshot.
+
+    Tabelas base (linhas brutas agrupadas):
+    - totais: somas por (COMPETIÇÃO, PLAYER, POSIÇÃO), com PARTIDAS = número de linhas
+    - estatisticas_rodada: somas por (COMPETIÇÃO, RODADA, PLAYER)
+    - partidas: combinações distintas de (COMPETIÇÃO, RODADA, PARTIDA)
+
+    Tabelas por competição (incluindo "Todas"), derivadas das tabelas base:
+    - por_jogador: somas por PLAYER
+    - rankings: tabela do Ranking Geral
+    - resumos: contagens de partidas e rodadas dos cards da HOME
+
+    Perfil, rodadas e médias da competição ficam nos índices de src/indices.py.
+    """
+    totais: pd.DataFrame
+    estatisticas_rodada: pd.DataFrame
+    partidas: pd.DataFrame
+    por_jogador: dict
+    rankings: dict
+    resumos: dict
+
+    def ranking(self, competicao: str = TODAS) -> pd.DataFrame:
+        return self.rankings.get(competicao, self.rankings[TODAS].iloc[0:0])
+
+
+def obter_agregados(fonte=None, temporada: str = TODAS) -> Agregados:
+    """
+    Retorna as tabelas agregadas de uma temporada (padrão: todas) do snapshot atual,
+    calculadas na primeira chamada após cada recarga.
+    """
+    return obter_snapshot(fonte).derivado('agregados', calcular_agregados, temporada)
+
+
+def calcular_agregados(df: pd.DataFrame) -> Agregados:
+    """
+    Calcula todas as tabelas agregadas a partir do DataFrame tratado.
+    """
+    return _derivar(**_tabelas_base(df))
+
+
+def mesclar_agregados(agregados: Agregados, df_novas: pd.DataFrame, df_completo: pd.DataFrame = None) -> Agregados:
+    """
+    Incorpora linhas novas às tabelas já calculadas, sem reagrupar as linhas antigas.
+
+    As tabelas base são combinadas (somas somadas, partidas unidas) e as tabelas por competição são
+    derivadas de novo a partir delas, o que custa o tamanho das tabelas, não da temporada.
+    """
+    novas = _tabelas_base(df_novas)
+
+    return _derivar(
+        totais=_somar(agregados.totais, novas['totais'], ['COMPETIÇÃO', 'PLAYER', 'POSIÇÃO']),
+        estatisticas_rodada=_somar(agregados.estatisticas_rodada, novas['estatisticas_rodada'], ['COMPETIÇÃO', 'RODADA', 'PLAYER']),
+        partidas=pd.concat([agregados.partidas, novas['partidas']]).drop_duplicates().reset_index(drop=True),
+    )
+
+
+def _somar(anterior: pd.DataFrame, novas: pd.DataFrame, chaves: list) -> pd.DataFrame:
+    return pd.concat([anterior, novas]).groupby(chaves, dropna=False).sum().reset_index()
+
+
+def _preparar(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Garante as colunas usadas nos agrupamentos (estatística ausente = 0), inclusive para o DataFrame vazio.
+    """
+    faltantes = {
+        col: (0 if col in COLUNAS_ESTATISTICAS else None)
+        for col in COLUNAS_CHAVE + COLUNAS_ESTATISTICAS
+        if col not in df.columns
+    }
+    return df.assign(**faltantes) if faltantes else df
+
+
+def _tabelas_base(df: pd.DataFrame) -> dict:
+    df = _preparar(df).assign(PARTIDAS=1)
+    colunas_soma = COLUNAS_ESTATISTICAS + ['PARTIDAS']
+
+    # dropna=False: as linhas sem competição continuam contando no filtro "Todas"
+    # observed=True: com colunas categóricas, só as combinações que existem nos dados
+    totais = df.groupby(['COMPETIÇÃO', 'PLAYER', 'POSIÇÃO'], dropna=False, observed=True)[colunas_soma].sum().reset_index()
+    estatisticas_rodada = df.groupby(['COMPETIÇÃO', 'RODADA', 'PLAYER'], observed=True)[colunas_soma].sum().reset_index()
+    partidas = df[['COMPETIÇÃO', 'RODADA', 'PARTIDA']].drop_duplicates().reset_index(drop=True)
+
+    # As tabelas agregadas são pequenas: voltam a texto simples para mesclar e plotar sem surpresas de categorias
+    return dict(
+        totais=_sem_categorias(totais),
+        estatisticas_rodada=_sem_categorias(estatisticas_rodada),
+        partidas=_sem_categorias(partidas),
+    )
+
+
+def _sem_categorias(tabela: pd.DataFrame) -> pd.DataFrame:
+    categoricas = tabela.select_dtypes('category').columns
+    return tabela.astype({col: object for col in categoricas})
+
+
+def _derivar(totais, estatisticas_rodada, partidas) -> Agregados:
+    por_jogador, rankings, resumos = {}, {}, {}
+
+    competicoes = [TODAS] + sorted(totais['COMPETIÇÃO'].dropna().unique())
+    for competicao in competicoes:
+        if competicao == TODAS:
+            totais_comp, partidas_comp = totais, partidas
+        else:
+            totais_comp = totais[totais['COMPETIÇÃO'] == competicao]
+            partidas_comp = partidas[partidas['COMPETIÇÃO'] == competicao]
+
+        colunas_soma = COLUNAS_ESTATISTICAS + ['PARTIDAS']
+        por_jogador[competicao] = totais_comp.groupby('PLAYER')[colunas_soma].sum()
+        rankings[competicao] = _ranking(totais_comp)
+        resumos[competicao] = _resumo(partidas_comp)
+
+    return Agregados(
+        totais=totais,
+        estatisticas_rodada=estatisticas_rodada,
+        partidas=partidas,
+        por_jogador=por_jogador,
+        rankings=rankings,
+        resumos=resumos,
+    )
+
+
+def _ranking(totais: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ranking Geral: somas por (PLAYER, POSIÇÃO), partidas por PLAYER e colocação pelos pontos.
+    """
+    partidas_jogadas = totais.groupby('PLAYER')['PARTIDAS'].sum().reset_index()
+    ranking = totais.groupby(['PLAYER', 'POSIÇÃO'])[COLUNAS_RANKING].sum().reset_index()
+    ranking = ranking.merge(partidas_jogadas, on='PLAYER', how='left')
+    ranking = ranking.sort_values(by='PTS', ascending=False).reset_index(drop=True)
+    ranking.insert(0, 'Posição', ranking.index + 1)
+    return ranking
+
+
+def _resumo(partidas: pd.DataFrame) -> dict:
+    """
+    Contagens distintas dos cards da HOME para uma competição (gols e primeiro colocado saem de por_jogador no navegador).
+    """
+    return {
+        'total_partidas': partidas['PARTIDA'].nunique(),
+        'quantidade_rodadas': partidas['RODADA'].nunique(),
+    }
+
+
+# Recargas incrementais somam as linhas novas às tabelas do snapshot anterior
+registrar_derivado_incremental('agregados', mesclar_agregados)
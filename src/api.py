@@ -0,0 +1,187 @@
+import os
+import json
+import hmac
+import hashlib
+from src.data_loader import obter_snapshot, forcar_atualizacao, versao_fixada, filtrar_temporada, TODAS
+from src.agregados import obter_agregados
+from src.indices import obter_indice_jogadores
+from src.snapshot_disco import VERSAO_SCHEMA
+from src import exportacao
+
+# Token (Bearer) exigido pela rota de atualização manual; vazio desativa a rota
+TOKEN_ATUALIZACAO = os.environ.get("API_TOKEN_ATUALIZACAO", "")
+
+# Prefixo das rotas de exportação (somente leitura)
+PREFIXO_EXPORTACAO = '/api/v1'
+
+
+def registrar_api(server) -> None:
+    """
+    Rotas HTTP do app fora do Dash:
+    - POST /api/atualizar: recarrega os dados agora (Authorization: Bearer <API_TOKEN_ATUALIZACAO>);
+      com ?completa=1 relê a fonte inteira em vez de buscar só as linhas novas.
+    - GET /api/v1/...: exportação dos dados tratados (ver registrar_exportacao).
+    """
+    from flask import jsonify, request
+
+    @server.route('/api/atualizar', methods=['POST'])
+    def atualizar():
+        if not TOKEN_ATUALIZACAO:
+            return jsonify(erro="Atualização manual desativada (defina API_TOKEN_ATUALIZACAO)"), 404
+
+        esquema, _, token = request.headers.get('Authorization', '').partition(' ')
+        if esquema.lower() != 'bearer' or not hmac.compare_digest(token.strip().encode(), TOKEN_ATUALIZACAO.encode()):
+            return jsonify(erro="Não autorizado"), 401
+
+        versao_anterior = obter_snapshot().versao
+        snapshot = forcar_atualizacao(completa=request.args.get('completa') == '1')
+        if snapshot is None:
+            return jsonify(erro="Falha ao carregar a fonte de dados"), 502
+
+        return jsonify(versao=snapshot.versao, linhas=len(snapshot.df), alterado=snapshot.versao != versao_anterior)
+
+    registrar_exportacao(server)
+
+
+def registrar_exportacao(server) -> None:
+    """
+    Rotas de exportação (GET), com os filtros ?temporada= e ?competicao= (padrão: todas)
+    e ?formato=json|csv|parquet nas tabelas (padrão: json):
+    - /api/v1/partidas: DataFrame tratado (uma linha por jogador por partida)
+    - /api/v1/ranking: Ranking Geral (?posicao= filtra a posição)
+    - /api/v1/rodadas: somas por (COMPETIÇÃO, RODADA, PLAYER) (?rodada= filtra a rodada)
+    - /api/v1/jogadores/<jogador>: perfil do jogador (JSON)
+    - /api/v1/jogadores/<jogador>/rodadas: pontos do jogador por rodada
+
+    Cada resposta leva um ETag da impressão digital dos dados e da consulta: enquanto os dados
+    não mudam, If-None-Match responde 304 sem corpo. As tabelas saem em streaming e, se o cliente
+    aceitar, comprimidas (brotli, quando o pacote estiver instalado, ou gzip).
+    """
+    from flask import Response, jsonify, request
+
+    def responder(construir, tabela: bool = True):
+        """
+        Monta a resposta com um snapshot só (fixado durante a consulta) e trata ETag, formato e compressão.
+        `construir()` retorna um DataFrame (tabela) ou um dict (JSON), ou None para 404.
+        """
+        formato = request.args.get('formato', 'json').lower() if tabela else 'json'
+        if formato not in exportacao.FORMATOS:
+            return jsonify(erro=f"Formato desconhecido: {formato} (use {', '.join(exportacao.FORMATOS)})"), 400
+
+        snapshot = obter_snapshot()
+        etag = _etag(snapshot, request.full_path)
+        if request.if_none_match.contains_weak(etag):
+            resposta = Response(status=304)
+        else:
+            with versao_fixada(snapshot.impressao):
+                conteudo = construir()
+            if conteudo is None:
+                return jsonify(erro="Não encontrado"), 404
+            resposta = resposta_tabela(conteudo, formato) if tabela else resposta_json(conteudo)
+
+        resposta.set_etag(etag, weak=True)
+        resposta.headers['Cache-Control'] = 'no-cache'
+        resposta.vary.add('Accept-Encoding')
+        return resposta
+
+    def resposta_tabela(df, formato: str):
+        blocos = exportacao.blocos_tabela(df, formato)
+        codificacao = None
+        if formato not in exportacao.FORMATOS_SEM_COMPRESSAO:
+            codificacao = exportacao.escolher_codificacao(request.accept_encodings)
+        if codificacao:
+            blocos = exportacao.comprimir(blocos, codificacao)
+
+        resposta = Response(blocos, mimetype=exportacao.FORMATOS[formato])
+        if codificacao:
+            resposta.headers['Content-Encoding'] = codificacao
+        if formato != 'json':
+            nome = request.path.rstrip('/').rsplit('/', 1)[-1]
+            resposta.headers['Content-Disposition'] = f'attachment; filename="{nome}.{formato}"'
+        return resposta
+
+    def resposta_json(conteudo: dict):
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode('utf-8')
+        codificacao = None
+        if len(corpo) >= exportacao.TAMANHO_MINIMO_COMPRESSAO:
+            codificacao = exportacao.escolher_codificacao(request.accept_encodings)
+        if codificacao:
+            corpo = b''.join(exportacao.comprimir([corpo], codificacao))
+
+        resposta = Response(corpo, mimetype=exportacao.FORMATOS['json'])
+        if codificacao:
+            resposta.headers['Content-Encoding'] = codificacao
+        return resposta
+
+    def filtros():
+        return request.args.get('temporada') or TODAS, request.args.get('competicao') or TODAS
+
+    @server.route(f'{PREFIXO_EXPORTACAO}/partidas')
+    def exportar_partidas():
+        def construir():
+            temporada, competicao = filtros()
+            df = filtrar_temporada(obter_snapshot().df, temporada)
+            if competicao != TODAS and 'COMPETIÇÃO' in df.columns:
+                df = df[df['COMPETIÇÃO'] == competicao]
+            return df
+        return responder(construir)
+
+    @server.route(f'{PREFIXO_EXPORTACAO}/ranking')
+    def exportar_ranking():
+        def construir():
+            temporada, competicao = filtros()
+            ranking = obter_agregados(temporada=temporada).ranking(competicao)
+            posicao = request.args.get('posicao')
+            if posicao and posicao != TODAS:
+                ranking = ranking[ranking['POSIÇÃO'] == posicao]
+            return ranking
+        return responder(construir)
+
+    @server.route(f'{PREFIXO_EXPORTACAO}/rodadas')
+    def exportar_rodadas():
+        def construir():
+            temporada, competicao = filtros()
+            rodadas = obter_agregados(temporada=temporada).estatisticas_rodada
+            if competicao != TODAS:
+                rodadas = rodadas[rodadas['COMPETIÇÃO'] == competicao]
+            rodada = request.args.get('rodada', type=int)
+            if rodada is not None:
+                rodadas = rodadas[rodadas['RODADA'] == rodada]
+            return rodadas
+        return responder(construir)
+
+    @server.route(f'{PREFIXO_EXPORTACAO}/jogadores/<jogador>')
+    def exportar_perfil(jogador):
+        def construir():
+            temporada, _ = filtros()
+            perfil = obter_indice_jogadores(temporada=temporada).perfis.get(jogador)
+            if perfil is None:
+                return None
+            return {
+                'PLAYER': jogador,
+                'POSIÇÃO': perfil.posicao,
+                'totais': {col: _valor_json(valor) for col, valor in perfil.totais.items()},
+                'pontos_por_rodada': json.loads(perfil.pts_por_rodada.to_json(orient='records')),
+            }
+        return responder(construir, tabela=False)
+
+    @server.route(f'{PREFIXO_EXPORTACAO}/jogadores/<jogador>/rodadas')
+    def exportar_rodadas_jogador(jogador):
+        def construir():
+            temporada, _ = filtros()
+            perfil = obter_indice_jogadores(temporada=temporada).perfis.get(jogador)
+            return None if perfil is None else perfil.pts_por_rodada
+        return responder(construir)
+
+
+def _etag(snapshot, consulta: str) -> str:
+    """
+    ETag de uma consulta sobre um snapshot: a impressão dos dados (a mesma em todos os workers, ver
+    Snapshot.impressao), a versão do schema e a consulta.
+    """
+    return f"{VERSAO_SCHEMA}-{snapshot.impressao}-{hashlib.sha1(consulta.encode()).hexdigest()[:12]}"
+
+
+def _valor_json(valor):
+    # Escalares do numpy (somas do pandas) viram int/float do Python
+    return valor.item() if hasattr(valor, 'item') else valor
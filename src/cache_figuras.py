@@ -0,0 +1,94 @@
+import os
+import json
+import functools
+import threading
+from collections import OrderedDict
+from plotly.io.json import to_json_plotly
+from src.data_loader import obter_snapshot
+from src import metricas
+
+# Número máximo de respostas de callbacks guardadas (as menos usadas saem primeiro)
+TAMANHO_MAXIMO = int(os.environ.get("CACHE_FIGURAS_TAMANHO", "256"))
+
+
+class CacheFiguras:
+    """
+    LRU de respostas de callbacks (serializadas em JSON), válido para uma versão do snapshot.
+    Quando chega uma versão nova dos dados, todas as entradas são descartadas.
+    As versões dos snapshots são crescentes, então uma resposta calculada com dados já superados é ignorada.
+    """
+
+    def __init__(self, tamanho_maximo: int = TAMANHO_MAXIMO):
+        self.tamanho_maximo = tamanho_maximo
+        self._entradas = OrderedDict()
+        self._versao = None
+        self._lock = threading.Lock()
+
+    def obter(self, chave, versao):
+        """
+        Retorna (encontrado, valor).
+        """
+        with self._lock:
+            if not self._versao_vigente(versao) or chave not in self._entradas:
+                return False, None
+            self._entradas.move_to_end(chave)
+            return True, self._entradas[chave]
+
+    def guardar(self, chave, versao, valor) -> None:
+        with self._lock:
+            if not self._versao_vigente(versao):
+                return
+            self._entradas[chave] = valor
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.tamanho_maximo:
+                self._entradas.popitem(last=False)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+
+    def _versao_vigente(self, versao) -> bool:
+        """
+        Ao ver uma versão mais nova descarta todas as entradas; versões já superadas não leem nem gravam.
+        """
+        if self._versao is None or versao > self._versao:
+            self._entradas.clear()
+            self._versao = versao
+        return versao == self._versao
+
+
+CACHE_FIGURAS = CacheFiguras()
+
+# Worker criado por fork: o lock pode ter sido copiado preso por uma thread do processo pai
+os.register_at_fork(after_in_child=lambda: setattr(CACHE_FIGURAS, '_lock', threading.Lock()))
+
+
+def memoizar_por_snapshot(funcao):
+    """
+    Memoiza um callback pela tupla (callback, valores de entrada, versão do snapshot).
+
+    Use logo abaixo do @callback. O retorno inteiro (figuras, componentes do Dash, tabelas) é guardado
+    como texto JSON, e cada chamada recebe uma cópia nova decodificada: nenhum objeto é compartilhado
+    entre requisições, então alterar o que um callback devolveu não muda o que o cache entrega depois.
+    Uma visualização repetida não refaz nem o pandas nem a montagem da figura.
+    """
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+    @functools.wraps(funcao)
+    def envolvida(*args):
+        versao = obter_snapshot().versao
+        chave = (nome, json.dumps(args, sort_keys=True, default=str))
+
+        encontrado, serializado = CACHE_FIGURAS.obter(chave, versao)
+        metricas.incrementar('mrleague_cache_total', cache='figuras', resultado='acerto' if encontrado else 'falha')
+        if not encontrado:
+            valor = funcao(*args)
+            # Várias saídas: a tupla vira lista no JSON e volta a ser tupla na leitura
+            serializado = (isinstance(valor, tuple), to_json_plotly(valor))
+            CACHE_FIGURAS.guardar(chave, versao, serializado)
+
+        multiplas_saidas, texto = serializado
+        valor = json.loads(texto)
+        return tuple(valor) if multiplas_saidas else valor
+
+    return envolvida
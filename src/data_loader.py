@@ -1,15 +1,37 @@
 import os
-import json
-import gspread
+import time
+import itertools
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+import numpy as np
 import pandas as pd
-from gspread_dataframe import get_as_dataframe
-from google.oauth2.service_account import Credentials
+from src.pontuacao import calcular_pontos
+from src import snapshot_disco, metricas
+from src.fontes_dados import FonteDados, FonteGoogleSheets, EsquemaAlterado, fonte_configurada, SHEET_ID, NOME_ABA, COLUNA_TEMPORADA
 
 # Variáveis fixas para o seu projeto
-SHEET_ID = "1_OQkQpER2aKNnSqezZb15L9u93i-kn2kBUDBwvjqeQI"
-NOME_ABA = "main"
 ARQUIVO_CREDENCIAL = "service_account.json"
 
+# Tempo (em segundos) que um snapshot é considerado atual antes de ser recarregado em segundo plano
+TTL_SEGUNDOS = float(os.environ.get("DADOS_TTL_SEGUNDOS", "300"))
+
+# Número de recargas incrementais (só linhas novas) antes de uma releitura completa da fonte,
+# que é o que captura edições em linhas antigas do Google Sheets (nas fontes locais elas são vistas na hora)
+RESSINCRONIZAR_A_CADA = int(os.environ.get("DADOS_RESSINCRONIZAR_A_CADA", "12"))
+
+# Tempo (em segundos) que um snapshot substituído continua disponível para as páginas que o fixaram
+FIXACAO_SEGUNDOS = float(os.environ.get("DADOS_FIXACAO_SEGUNDOS", "60"))
+
+# Schema tipado do DataFrame tratado
+COLUNAS_CATEGORICAS = ['COMPETIÇÃO', 'PLAYER', 'POSIÇÃO', 'TIME', COLUNA_TEMPORADA]
+COLUNAS_NUMERO = ['RODADA', 'PARTIDA']
+
+# Filtro (de temporada ou de competição) que considera todas as linhas
+TODAS = "Todas"
+
 # Critérios de pontos
 CRITERIOS = {
     'ATA': {'V': 7, 'E': 0, 'D': -4, 'GOL': 7, 'ASS': 4, 'STG': 2, 'GC': -10, 'AMA': -4, 'AZUL': -8, 'VER': -16, 'PP': -10, 'GS': 0, 'DD': 0, 'DP': 0},
@@ -18,57 +40,570 @@ CRITERIOS = {
     'GK':  {'V': 6, 'E': 0, 'D': -3, 'GOL': 16, 'ASS': 10, 'STG': 4, 'GC': -10, 'AMA': -4, 'AZUL': -8, 'VER': -16, 'PP': -10, 'GS': -5, 'DD': 5, 'DP': 20}
 }
 
+
+@dataclass
+class Ingestao:
+    """
+    Até onde a fonte já foi lida, para que a próxima recarga busque só as linhas novas.
+    """
+    linhas: int             # linhas de dados já lidas
+    colunas: tuple          # cabeçalho da última leitura completa
+    ultima_linha: tuple     # valores brutos da última linha lida (detecta edição ou remoção)
+    incrementais: int = 0   # recargas incrementais desde a última leitura completa
+    hash_conteudo: int = None   # impressão digital das linhas brutas (ver _hash_linhas)
+
+
+@dataclass
+class Snapshot:
+    """
+    Versão tratada dos dados mantida em memória pelo cache do processo.
+    """
+    df: pd.DataFrame
+    versao: int
+    carregado_em: float
+    ingestao: Ingestao = None
+    _derivados: dict = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def impressao(self) -> str:
+        """
+        Identifica os dados do snapshot em qualquer processo: a impressão digital do conteúdo, que é a mesma
+        em todos os workers que leram a mesma planilha. Sem ela (snapshot antigo em disco), vale a versão
+        prefixada pelo pid, que nenhum outro processo reconhece.
+        """
+        if self.ingestao is not None and self.ingestao.hash_conteudo is not None:
+            return f"{self.ingestao.hash_conteudo:016x}"
+        return f"{os.getpid()}.{self.versao}"
+
+    def derivado(self, chave, construtor, temporada: str = TODAS):
+        """
+        Retorna uma estrutura derivada do df (ex.: tabelas agregadas), construída uma única vez por snapshot
+        e por temporada (`construtor` recebe só as linhas da temporada; TODAS = todas as linhas).
+        """
+        with self._lock:
+            if (chave, temporada) not in self._derivados:
+                with metricas.cronometro('mrleague_derivado_segundos', chave=str(chave)):
+                    self._derivados[(chave, temporada)] = construtor(filtrar_temporada(self.df, temporada))
+            return self._derivados[(chave, temporada)]
+
+    def limpar_derivados(self) -> None:
+        with self._lock:
+            self._derivados.clear()
+
+
+class _Carga:
+    """
+    Carga de uma fonte em andamento: quem pede a mesma fonte durante a carga espera por ela
+    e recebe o mesmo snapshot, em vez de abrir outra leitura.
+    """
+
+    def __init__(self, completa: bool):
+        self.completa = completa
+        self.concluida = threading.Event()
+        self.snapshot = None
+
+
+# Cache de snapshots por fonte de dados, compartilhado por todos os callbacks do processo
+_snapshots = {}
+_cargas_em_andamento = {}
+_lock_snapshots = threading.Lock()
+_contador_versoes = itertools.count(1)
+
+# Como atualizar cada estrutura derivada quando chegam só linhas novas
+_atualizadores_incrementais = {}
+
+# Última atualização forçada (marca em disco) já atendida por este processo, por fonte
+_forcadas_vistas = {}
+
+# Snapshots já substituídos, por versão: (fonte, snapshot, substituído em)
+_substituidos = {}
+
+# Impressão do snapshot fixada pela página que disparou o callback (ver fixar_snapshot)
+_impressao_fixada = contextvars.ContextVar('impressao_fixada', default=None)
+
+
+def _reiniciar_apos_fork() -> None:
+    """
+    No worker criado por fork (gunicorn com preload) os snapshots do processo pai continuam valendo,
+    mas locks e recargas em andamento não: as threads de recarga não existem no filho.
+    """
+    global _lock_snapshots
+    _lock_snapshots = threading.Lock()
+    _cargas_em_andamento.clear()
+    for snapshot in _snapshots.values():
+        snapshot._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reiniciar_apos_fork)
+
+
+def carregar_dados(fonte: FonteDados = None) -> pd.DataFrame:
+    """
+    Retorna o DataFrame tratado da fonte (padrão: a configurada em FONTE_DADOS), servido pelo cache de snapshots.
+    """
+    return obter_snapshot(fonte).df
+
+
 def carregar_dados_google_sheets(sheet_id: str = SHEET_ID, nome_aba: str = NOME_ABA) -> pd.DataFrame:
     """
-    Carrega e trata os dados de uma aba do Google Sheets.
+    Retorna o DataFrame tratado de uma aba específica do Google Sheets, servido pelo cache de snapshots.
     """
+    return carregar_dados(FonteGoogleSheets(sheet_id, nome_aba))
+
+
+def obter_snapshot(fonte: FonteDados = None) -> Snapshot:
+    """
+    Retorna o último snapshot válido da fonte.
+
+    - Sem snapshot em memória: usa o snapshot gravado em disco, se houver um compatível
+      (e agenda a recarga); senão carrega de forma síncrona.
+    - Snapshot mais velho que TTL_SEGUNDOS: devolve o snapshot atual na hora
+      e agenda a recarga em segundo plano (stale-while-revalidate).
+    - Falha na recarga: o último snapshot válido continua sendo servido.
+    - Dentro de um callback com fixar_snapshot: o snapshot fixado pela página, enquanto ele estiver disponível.
+    """
+    fonte = fonte or fonte_configurada()
+    impressao = _impressao_fixada.get()
+    with _lock_snapshots:
+        snapshot = _snapshots.get(fonte)
+        if impressao is not None and snapshot is not None and snapshot.impressao != impressao:
+            fixado = _snapshot_substituido(fonte, impressao)
+            if fixado is not None:
+                return fixado
+
+    if snapshot is None:
+        metricas.incrementar('mrleague_cache_total', cache='snapshot', resultado='falha')
+        _forcada_pendente(fonte)  # o que já foi forçado antes do processo subir não conta
+        snapshot = _snapshot_do_disco(fonte)
+        if snapshot is not None:
+            _agendar_atualizacao(fonte)
+            return snapshot
+
+        snapshot = _atualizar_snapshot(fonte)
+        if snapshot is None:
+            # Nenhuma carga bem-sucedida até agora: mantém o comportamento antigo (DataFrame vazio)
+            return Snapshot(df=pd.DataFrame(), versao=0, carregado_em=0.0)
+        return snapshot
+
+    if time.monotonic() - snapshot.carregado_em > TTL_SEGUNDOS or _forcada_pendente(fonte):
+        metricas.incrementar('mrleague_cache_total', cache='snapshot', resultado='vencido')
+        _agendar_atualizacao(fonte)
+    else:
+        metricas.incrementar('mrleague_cache_total', cache='snapshot', resultado='acerto')
+
+    return snapshot
+
+
+def fixar_snapshot(funcao):
+    """
+    Faz um callback ler o snapshot fixado pela página, para que todos os callbacks
+    de uma mesma renderização vejam os mesmos dados mesmo que uma recarga termine no meio.
+
+    O último argumento do callback deve ser a `Snapshot.impressao` (State do dcc.Store preenchido junto
+    com as temporadas); ele não é repassado à função. Use logo abaixo do @callback (acima do @memoizar_por_snapshot).
+    A impressão vale em qualquer worker: o callback pode cair num processo diferente do que renderizou a página.
+    Impressão vazia, desconhecida neste processo ou que já saiu da memória: vale o snapshot atual.
+    """
+    @functools.wraps(funcao)
+    def envolvida(*args):
+        *args, impressao = args
+        with versao_fixada(impressao):
+            return funcao(*args)
+
+    return envolvida
+
+
+@contextmanager
+def versao_fixada(impressao: str):
+    """
+    Dentro do bloco, obter_snapshot devolve o snapshot com essa impressão (se ainda estiver disponível).
+    """
+    token = _impressao_fixada.set(impressao)
     try:
-        scopes = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+        yield
+    finally:
+        _impressao_fixada.reset(token)
+
+
+def _snapshot_substituido(fonte: FonteDados, impressao: str):
+    """
+    Snapshot já substituído da fonte com essa impressão, se ainda estiver disponível (chamar com _lock_snapshots).
+    """
+    _descartar_substituidos()
+    for fonte_fixada, snapshot, _ in _substituidos.values():
+        if fonte_fixada == fonte and snapshot.impressao == impressao:
+            return snapshot
+    return None
+
+
+def _descartar_substituidos() -> None:
+    agora = time.monotonic()
+    for versao in [versao for versao, (_, _, em) in _substituidos.items() if agora - em > FIXACAO_SEGUNDOS]:
+        del _substituidos[versao]
+
+
+def forcar_atualizacao(fonte: FonteDados = None, completa: bool = False):
+    """
+    Recarrega a fonte agora, sem esperar o TTL (ex.: logo depois de lançar os resultados de uma rodada).
+
+    Os outros processos (workers do gunicorn) são avisados por uma marca em disco e recarregam
+    na próxima requisição. Retorna o snapshot publicado, ou None se a carga falhou.
+    """
+    fonte = fonte or fonte_configurada()
+    snapshot = _atualizar_snapshot(fonte, completa=completa)
+    if snapshot is not None:
+        try:
+            momento = snapshot_disco.marcar_atualizacao_forcada(fonte)
+        except Exception as e:
+            print(f"[AVISO] Falha ao gravar a marca de atualização de {fonte}: {str(e)}")
+        else:
+            if momento is not None:
+                with _lock_snapshots:
+                    _forcadas_vistas[fonte] = momento
+    return snapshot
+
+
+def _forcada_pendente(fonte: FonteDados) -> bool:
+    """
+    Indica (uma única vez) que outro processo forçou uma atualização desde a última vista por este.
+    """
+    momento = snapshot_disco.momento_atualizacao_forcada(fonte)
+    if momento is None:
+        return False
+    with _lock_snapshots:
+        pendente = momento > _forcadas_vistas.get(fonte, float('-inf'))
+        _forcadas_vistas[fonte] = momento
+    return pendente and fonte in _snapshots
+
+
+def aquecer(fonte: FonteDados = None) -> Snapshot:
+    """
+    Carrega a fonte de forma síncrona e sem threads de fundo, para rodar no processo pai antes do fork.
+    Se a fonte falhar, usa o snapshot em disco. Retorna o snapshot publicado (ou None).
+    """
+    fonte = fonte or fonte_configurada()
+    snapshot = _atualizar_snapshot(fonte)
+    if snapshot is None:
+        snapshot = _snapshot_do_disco(fonte)
+    return snapshot
 
-        # Lendo o JSON da variável de ambiente
-        service_account_info = json.loads(os.environ['GOOGLE_SERVICE_ACCOUNT'])
-        credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
 
-        # Conexão com o Google Sheets
-        client = gspread.authorize(credentials)
-        sheet = client.open_by_key(sheet_id)
-        worksheet = sheet.worksheet(nome_aba)
+def obter_temporadas(fonte: FonteDados = None) -> list:
+    """
+    Temporadas presentes no snapshot atual, em ordem; vazia quando a fonte não separa temporadas.
+    """
+    return obter_snapshot(fonte).derivado('temporadas', listar_temporadas)
+
 
-        # Carrega a planilha como DataFrame
-        df = get_as_dataframe(worksheet, evaluate_formulas=True, dtype=str)
+def listar_temporadas(df: pd.DataFrame) -> list:
+    if COLUNA_TEMPORADA not in df.columns:
+        return []
+    return sorted(str(temporada) for temporada in df[COLUNA_TEMPORADA].dropna().unique())
 
-        # Aplica seu tratamento personalizado
-        df = tratar_dataframe(df)
 
-        # print(f"[INFO] Dados carregados e tratados: {df.shape[0]} linhas, {df.shape[1]} colunas.")
+def filtrar_temporada(df: pd.DataFrame, temporada: str) -> pd.DataFrame:
+    """
+    Linhas de uma temporada; com TODAS (ou sem a coluna TEMPORADA) devolve o próprio df.
+    """
+    if temporada in (None, TODAS) or COLUNA_TEMPORADA not in df.columns:
         return df
+    return df[df[COLUNA_TEMPORADA] == temporada]
+
+
+def _agendar_atualizacao(fonte: FonteDados) -> None:
+    """
+    Dispara a recarga da fonte em uma thread de fundo, a menos que já haja uma carga em andamento.
+    """
+    with _lock_snapshots:
+        if fonte in _cargas_em_andamento:
+            return
+
+    thread = threading.Thread(target=_atualizar_snapshot, args=(fonte,), daemon=True)
+    thread.start()
+
+
+def registrar_derivado_incremental(chave, atualizar) -> None:
+    """
+    Registra como levar um derivado do snapshot anterior para o novo quando só chegaram linhas novas:
+    `atualizar(valor_anterior, df_novas, df_completo)` retorna o novo valor.
+    Os dois DataFrames chegam já filtrados pela temporada do derivado; uma temporada sem linhas novas
+    mantém o valor anterior. Derivados sem atualizador registrado são reconstruídos sob demanda no novo snapshot.
+    """
+    _atualizadores_incrementais[chave] = atualizar
+
+
+def _atualizar_snapshot(fonte: FonteDados, completa: bool = False):
+    """
+    Carrega a fonte uma única vez por vez (single-flight): recargas em segundo plano, cargas síncronas
+    de um processo sem snapshot e atualizações forçadas que chegam juntas esperam a carga em andamento
+    e recebem o mesmo resultado. Um pedido de carga completa só reaproveita outra carga completa;
+    se a carga em andamento for incremental, ele espera e faz a sua em seguida.
+    """
+    with _lock_snapshots:
+        carga = _cargas_em_andamento.get(fonte)
+        dono = carga is None
+        if dono:
+            carga = _cargas_em_andamento[fonte] = _Carga(completa)
+
+    if not dono:
+        metricas.incrementar('mrleague_cache_total', cache='carga', resultado='compartilhada')
+        carga.concluida.wait()
+        if carga.completa or not completa:
+            return carga.snapshot
+        return _atualizar_snapshot(fonte, completa=True)
+
+    try:
+        carga.snapshot = _carregar_e_publicar(fonte, completa)
+    finally:
+        with _lock_snapshots:
+            _cargas_em_andamento.pop(fonte, None)
+        carga.concluida.set()
+    return carga.snapshot
+
+
+def _carregar_e_publicar(fonte: FonteDados, completa: bool = False):
+    """
+    Lê e trata os dados da fonte e publica um novo snapshot.
+
+    Quando possível a recarga é incremental (só as linhas novas são lidas e tratadas);
+    caso contrário, a cada RESSINCRONIZAR_A_CADA recargas ou com `completa`, a fonte é relida por completo.
+    Se o conteúdo lido for idêntico ao do snapshot atual, ele é mantido (mesma versão, nada é reprocessado).
+    Em caso de falha mantém o snapshot anterior e retorna None.
+    """
+    with _lock_snapshots:
+        anterior = _snapshots.get(fonte)
+
+    try:
+        snapshot = None
+        if not completa and _pode_ler_incremental(anterior):
+            snapshot = _carga_incremental(fonte, anterior)
+        if snapshot is None:
+            snapshot = _carga_completa(fonte, anterior)
+    except Exception as e:
+        print(f"[ERRO] Falha ao carregar dados de {fonte}: {str(e)}")
+        metricas.incrementar('mrleague_carga_erros_total')
+        return None
+
+    with _lock_snapshots:
+        _snapshots[fonte] = snapshot
+        if anterior is not None and anterior.versao != snapshot.versao:
+            # Callbacks de páginas abertas com a versão anterior ainda a encontram por FIXACAO_SEGUNDOS
+            _substituidos[anterior.versao] = (fonte, anterior, time.monotonic())
+            _descartar_substituidos()
+    metricas.definir('mrleague_snapshot_linhas', len(snapshot.df))
+    metricas.definir('mrleague_snapshot_versao', snapshot.versao)
+
+    if anterior is None or snapshot.versao != anterior.versao:
+        _gravar_no_disco(fonte, snapshot)
+    return snapshot
+
+
+def _snapshot_do_disco(fonte: FonteDados):
+    """
+    Publica o snapshot gravado em disco como ponto de partida do processo (ex.: worker recém-iniciado).
+    Ele nasce vencido, para que a primeira requisição já dispare a recarga em segundo plano.
+    """
+    try:
+        lido = snapshot_disco.ler_snapshot(fonte)
+    except Exception as e:
+        print(f"[AVISO] Falha ao ler snapshot em disco de {fonte}: {str(e)}")
+        return None
+    if lido is None:
+        return None
+
+    df, ingestao = lido
+    if ingestao is not None:
+        ingestao = Ingestao(
+            linhas=ingestao['linhas'],
+            colunas=tuple(ingestao['colunas']),
+            ultima_linha=tuple(ingestao['ultima_linha']),
+            incrementais=ingestao['incrementais'],
+            hash_conteudo=ingestao.get('hash_conteudo'),
+        )
+    snapshot = Snapshot(df=df, versao=next(_contador_versoes), carregado_em=float('-inf'), ingestao=ingestao)
 
+    with _lock_snapshots:
+        # Outra thread pode ter carregado a fonte enquanto o arquivo era lido
+        return _snapshots.setdefault(fonte, snapshot)
+
+
+def _gravar_no_disco(fonte: FonteDados, snapshot: Snapshot) -> None:
+    try:
+        snapshot_disco.salvar_snapshot(fonte, snapshot.df, asdict(snapshot.ingestao) if snapshot.ingestao else None)
     except Exception as e:
-        print(f"[ERRO] Falha ao carregar dados do Google Sheets: {str(e)}")
-        return pd.DataFrame()
+        print(f"[AVISO] Falha ao gravar snapshot em disco de {fonte}: {str(e)}")
+
+
+def _pode_ler_incremental(anterior: Snapshot) -> bool:
+    return (
+        anterior is not None
+        and anterior.ingestao is not None
+        and anterior.ingestao.linhas > 0
+        and anterior.ingestao.incrementais < RESSINCRONIZAR_A_CADA
+    )
+
+
+def _carga_completa(fonte: FonteDados, anterior: Snapshot = None, brutas: pd.DataFrame = None) -> Snapshot:
+    """
+    Trata a fonte inteira; `brutas` reaproveita uma leitura completa já feita.
+    """
+    if brutas is None:
+        with metricas.cronometro('mrleague_fonte_leitura_segundos', carga='completa'):
+            brutas = fonte.ler()
+    ingestao = Ingestao(
+        linhas=len(brutas),
+        colunas=tuple(brutas.columns),
+        ultima_linha=_valores_linha(brutas.iloc[-1]) if len(brutas) else (),
+        hash_conteudo=_hash_linhas(brutas),
+    )
+
+    if (
+        anterior is not None
+        and anterior.ingestao is not None
+        and anterior.ingestao.colunas == ingestao.colunas
+        and anterior.ingestao.hash_conteudo == ingestao.hash_conteudo
+    ):
+        # Planilha igual à do snapshot atual: nada de tratar_dataframe nem de recalcular derivados,
+        # e a versão continua a mesma (os caches por versão seguem válidos)
+        metricas.incrementar('mrleague_cache_total', cache='conteudo', resultado='inalterado')
+        anterior.ingestao = ingestao
+        anterior.carregado_em = time.monotonic()
+        return anterior
+
+    metricas.incrementar('mrleague_cache_total', cache='conteudo', resultado='alterado')
+    with metricas.cronometro('mrleague_tratamento_segundos', carga='completa'):
+        df = tratar_dataframe(brutas)
+    return Snapshot(df=df, versao=next(_contador_versoes), carregado_em=time.monotonic(), ingestao=ingestao)
+
+
+def _carga_incremental(fonte: FonteDados, anterior: Snapshot):
+    """
+    Busca a partir da última linha já lida e trata só as linhas seguintes.
+    Retorna None quando é preciso reler tudo (cabeçalho mudou, ou a última linha lida foi editada/removida).
+
+    Fontes locais (leitura_parcial False) leem o arquivo inteiro de qualquer forma: a impressão digital
+    das linhas já lidas é conferida, e uma edição em qualquer linha antiga leva à carga completa na hora,
+    reaproveitando a leitura. No Google Sheets só o intervalo novo é buscado, então uma edição acima da
+    última linha (sem remoção nem inserção) só aparece na ressincronização a cada RESSINCRONIZAR_A_CADA recargas.
+    """
+    ingestao = anterior.ingestao
+    # Relê a última linha conhecida junto com as novas para confirmar que nada acima dela mudou de lugar
+    inicio = ingestao.linhas - 1 if fonte.leitura_parcial else 0
+    try:
+        with metricas.cronometro('mrleague_fonte_leitura_segundos', carga='incremental'):
+            brutas = fonte.ler_a_partir_de(inicio, list(ingestao.colunas))
+    except EsquemaAlterado:
+        return None
+
+    if not fonte.leitura_parcial:
+        if ingestao.hash_conteudo is None:
+            # Snapshot sem impressão digital (gravado em disco por uma versão antiga): não há o que conferir
+            return None
+        if len(brutas) < ingestao.linhas or _hash_linhas(brutas.iloc[:ingestao.linhas]) != ingestao.hash_conteudo:
+            return _carga_completa(fonte, anterior, brutas)
+        brutas = brutas.iloc[ingestao.linhas - 1:].reset_index(drop=True)
+
+    if brutas.empty or _valores_linha(brutas.iloc[0]) != ingestao.ultima_linha:
+        return None
+
+    novas = brutas.iloc[1:].reset_index(drop=True)
+    proxima = Ingestao(
+        linhas=ingestao.linhas + len(novas),
+        colunas=ingestao.colunas,
+        ultima_linha=_valores_linha(brutas.iloc[-1]),
+        incrementais=ingestao.incrementais + 1,
+        # A impressão digital é uma soma por linha: as linhas novas só somam a sua parte
+        hash_conteudo=(
+            None if ingestao.hash_conteudo is None
+            else (ingestao.hash_conteudo + _hash_linhas(novas, inicio=ingestao.linhas)) % 2 ** 64
+        ),
+    )
+
+    if novas.empty:
+        # Nada novo: o mesmo snapshot (e a mesma versão) continua valendo por mais um TTL
+        anterior.ingestao = proxima
+        anterior.carregado_em = time.monotonic()
+        return anterior
+
+    with metricas.cronometro('mrleague_tratamento_segundos', carga='incremental'):
+        df_novas = tratar_dataframe(novas)
+    df = concatenar_tratados(anterior.df, df_novas)
+    snapshot = Snapshot(df=df, versao=next(_contador_versoes), carregado_em=time.monotonic(), ingestao=proxima)
+
+    with anterior._lock:
+        derivados = list(anterior._derivados.items())
+    for (chave, temporada), valor in derivados:
+        if chave not in _atualizadores_incrementais:
+            continue
+        novas_temporada = filtrar_temporada(df_novas, temporada)
+        if novas_temporada.empty:
+            snapshot._derivados[(chave, temporada)] = valor
+        else:
+            atualizar = _atualizadores_incrementais[chave]
+            snapshot._derivados[(chave, temporada)] = atualizar(valor, novas_temporada, filtrar_temporada(df, temporada))
+
+    return snapshot
+
+
+def _hash_linhas(brutas: pd.DataFrame, inicio: int = 0) -> int:
+    """
+    Impressão digital (64 bits) das linhas brutas: soma dos hashes de (conteúdo da linha, posição).
+
+    Os valores são comparados como texto, como em _valores_linha, para que a leitura completa e a
+    incremental da mesma planilha coincidam. Por ser uma soma, o valor de linhas anexadas pode ser
+    somado ao de antes (com `inicio` = posição da primeira linha nova).
+    """
+    if brutas.empty:
+        return 0
+    linhas = pd.util.hash_pandas_object(brutas.astype(str), index=False).to_numpy()
+    posicoes = np.arange(inicio, inicio + len(linhas), dtype=np.uint64)
+    return int(pd.util.hash_array(linhas ^ posicoes).sum(dtype=np.uint64))
+
+
+def _valores_linha(linha: pd.Series) -> tuple:
+    return tuple(None if pd.isna(valor) else str(valor) for valor in linha)
 
 
 def tratar_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Trata o DataFrame: converte tipos e cria a coluna de pontos (PTS).
+    Trata o DataFrame: aplica o schema tipado e cria a coluna de pontos (PTS).
     """
     # 1. Lista de colunas que devem ser numéricas
     colunas_para_int = ['V', 'E', 'D', 'GOL', 'ASS', 'STG', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP', 'FALTA']
 
-    # 2. Converte essas colunas para int, preenchendo valores ausentes com 0 antes
+    # 2. Converte essas colunas para int, preenchendo valores ausentes com 0 antes,
+    #    no menor inteiro que comporta os valores (int8; int16 se algum valor passar de 127)
     for col in colunas_para_int:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col].fillna(0), errors='coerce').fillna(0).astype(int)
+            valores = pd.to_numeric(df[col].fillna(0), errors='coerce').fillna(0).astype(int)
+            df[col] = pd.to_numeric(valores, downcast='integer')
 
-    # 3. Função interna para calcular pontos linha a linha
-    def calcular_pontos(row):
-        posicao = row['POSIÇÃO']
-        if posicao not in CRITERIOS:
-            return 0  # posição desconhecida
-        pontos = sum(row[col] * CRITERIOS[posicao].get(col, 0) for col in CRITERIOS[posicao])
-        return pontos
+    # 3. Rodada e partida como inteiros de verdade (Int16 aceita ausentes)
+    for col in COLUNAS_NUMERO:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int16')
+
+    # 4. Textos com poucos valores distintos como categorias
+    for col in COLUNAS_CATEGORICAS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
 
-    # 4. Aplica a função no DataFrame
-    df['PTS'] = df.apply(calcular_pontos, axis=1)
+    # 5. Calcula os pontos de todas as linhas de uma vez (matriz de pesos por posição; posição desconhecida = 0)
+    df['PTS'] = calcular_pontos(df, CRITERIOS)
 
     return df
+
+
+def concatenar_tratados(anterior: pd.DataFrame, novas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Anexa linhas já tratadas a um DataFrame tratado, mantendo as colunas categóricas como categorias.
+    (O pd.concat de categorias diferentes viraria object; aqui as categorias são unidas antes.)
+    """
+    anterior, novas = anterior.copy(deep=False), novas.copy(deep=False)
+    for col in COLUNAS_CATEGORICAS:
+        if col in anterior.columns and col in novas.columns:
+            categorias = anterior[col].cat.categories.union(novas[col].cat.categories)
+            anterior[col] = anterior[col].cat.set_categories(categorias)
+            novas[col] = novas[col].cat.set_categories(categorias)
+    return pd.concat([anterior, novas], ignore_index=True)
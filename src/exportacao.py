@@ -0,0 +1,136 @@
+"""
+Serialização das tabelas da API de exportação (JSON, CSV e Parquet) em blocos, com compressão opcional.
+
+O corpo é gerado aos poucos, LINHAS_POR_BLOCO linhas por vez: a resposta começa a sair antes de a tabela
+inteira ser convertida, e nunca existe uma cópia completa do corpo em memória.
+"""
+import io
+import zlib
+import importlib.util
+import pandas as pd
+
+# Linhas convertidas por bloco (e por row group no Parquet)
+LINHAS_POR_BLOCO = 5000
+
+# Respostas pequenas (fora do streaming) abaixo deste tamanho vão sem compressão
+TAMANHO_MINIMO_COMPRESSAO = 1024
+
+NIVEL_GZIP = 6
+QUALIDADE_BROTLI = 5
+
+FORMATOS = {
+    'json': 'application/json',
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# O Parquet já é comprimido por coluna: comprimir de novo só gasta CPU
+FORMATOS_SEM_COMPRESSAO = {'parquet'}
+
+# brotli é opcional: sem o pacote, só gzip é oferecido
+BROTLI_DISPONIVEL = importlib.util.find_spec('brotli') is not None
+
+
+def blocos_tabela(df: pd.DataFrame, formato: str):
+    """
+    Gera o corpo da tabela no formato pedido, em blocos de bytes.
+    """
+    if formato == 'csv':
+        return _blocos_csv(df)
+    if formato == 'parquet':
+        return _blocos_parquet(df)
+    return _blocos_json(df)
+
+
+def escolher_codificacao(accept_encoding) -> str:
+    """
+    'br', 'gzip' ou None conforme o Accept-Encoding do cliente (werkzeug.datastructures.Accept).
+    """
+    if BROTLI_DISPONIVEL and accept_encoding['br'] > 0:
+        return 'br'
+    if accept_encoding['gzip'] > 0:
+        return 'gzip'
+    return None
+
+
+def comprimir(blocos, codificacao: str):
+    """
+    Comprime um gerador de blocos sem juntá-los (a compressão também é em streaming).
+    """
+    if codificacao == 'br':
+        import brotli
+        compressor = brotli.Compressor(quality=QUALIDADE_BROTLI)
+        comprimir_bloco, finalizar = compressor.process, compressor.finish
+    else:
+        # wbits=31: formato gzip (cabeçalho e CRC), não zlib puro
+        compressor = zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 31)
+        comprimir_bloco, finalizar = compressor.compress, compressor.flush
+
+    for bloco in blocos:
+        saida = comprimir_bloco(bloco)
+        if saida:
+            yield saida
+    yield finalizar()
+
+
+def _fatias(df: pd.DataFrame):
+    for inicio in range(0, len(df), LINHAS_POR_BLOCO):
+        yield df.iloc[inicio:inicio + LINHAS_POR_BLOCO]
+
+
+def _blocos_json(df: pd.DataFrame):
+    # Lista de registros: "[" + registros de cada fatia separados por vírgula + "]"
+    yield b'['
+    for numero, fatia in enumerate(_fatias(df)):
+        registros = fatia.to_json(orient='records', force_ascii=False, date_format='iso')[1:-1]
+        yield ((',' if numero else '') + registros).encode('utf-8')
+    yield b']'
+
+
+def _blocos_csv(df: pd.DataFrame):
+    yield df.iloc[0:0].to_csv(index=False).encode('utf-8')
+    for fatia in _fatias(df):
+        yield fatia.to_csv(index=False, header=False).encode('utf-8')
+
+
+class _SaidaEmBlocos(io.RawIOBase):
+    """
+    Destino do ParquetWriter que guarda só o que foi escrito desde a última retirada
+    (o tell() continua contando o total, que o Parquet usa nos offsets do rodapé).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._blocos = []
+        self._posicao = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, dados) -> int:
+        self._blocos.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self) -> int:
+        return self._posicao
+
+    def retirar(self) -> bytes:
+        blocos, self._blocos = self._blocos, []
+        return b''.join(blocos)
+
+
+def _blocos_parquet(df: pd.DataFrame):
+    # pyarrow importado só quando alguém pede Parquet
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    saida = _SaidaEmBlocos()
+    with pq.ParquetWriter(saida, tabela.schema) as escritor:
+        # Um row group por bloco: cada um sai assim que é escrito
+        for inicio in range(0, len(df), LINHAS_POR_BLOCO):
+            escritor.write_table(tabela.slice(inicio, LINHAS_POR_BLOCO))
+            yield saida.retirar()
+    # Rodapé com o schema e os offsets dos row groups
+    yield saida.retirar()
@@ -0,0 +1,290 @@
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import pandas as pd
+
+# Planilha oficial da temporada
+SHEET_ID = "1_OQkQpER2aKNnSqezZb15L9u93i-kn2kBUDBwvjqeQI"
+NOME_ABA = "main"
+
+# Coluna que identifica a temporada de cada linha quando a fonte junta várias temporadas
+COLUNA_TEMPORADA = "TEMPORADA"
+
+# Máximo de abas/arquivos lidos ao mesmo tempo por uma FonteTemporadas
+MAX_LEITURAS_PARALELAS = int(os.environ.get("FONTE_DADOS_MAX_LEITURAS", "4"))
+
+
+class ClienteSheets:
+    """
+    Cliente gspread autenticado uma única vez e compartilhado por todo o processo.
+
+    As credenciais (com a renovação automática do token) e a sessão HTTP do gspread são reaproveitadas
+    entre as recargas, e as abas já resolvidas ficam em cache por (sheet_id, nome_aba), então uma recarga
+    não repete a autenticação, o open_by_key nem o handshake TLS.
+    `autorizar` cria o cliente; em testes pode devolver um stub com open_by_key(...).worksheet(...).
+    """
+
+    def __init__(self, autorizar=None):
+        self._autorizar = autorizar or _autorizar_service_account
+        self._cliente = None
+        self._abas = {}
+        self._lock = threading.Lock()
+
+    def reiniciar(self) -> None:
+        """
+        Esquece cliente e abas (ex.: num worker recém-criado por fork, que não deve reusar as conexões do processo pai).
+        """
+        self._cliente = None
+        self._abas = {}
+        self._lock = threading.Lock()
+
+    def aba(self, sheet_id: str, nome_aba: str):
+        chave = (sheet_id, nome_aba)
+        with self._lock:
+            if chave in self._abas:
+                return self._abas[chave]
+            if self._cliente is None:
+                self._cliente = self._autorizar()
+            cliente = self._cliente
+
+        # Fora do lock: abas diferentes (ex.: várias temporadas) são resolvidas em paralelo
+        aba = cliente.open_by_key(sheet_id).worksheet(nome_aba)
+        with self._lock:
+            return self._abas.setdefault(chave, aba)
+
+    def descartar(self, sheet_id: str, nome_aba: str) -> None:
+        """
+        Esquece a aba após um erro, para que a próxima chamada a resolva de novo.
+        """
+        with self._lock:
+            self._abas.pop((sheet_id, nome_aba), None)
+
+
+def _autorizar_service_account():
+    # Bibliotecas do Google importadas só quando a fonte é o Sheets (as fontes locais não pagam esse custo)
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    scopes = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+
+    # Lendo o JSON da variável de ambiente
+    service_account_info = json.loads(os.environ['GOOGLE_SERVICE_ACCOUNT'])
+    credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
+
+    # Conexão com o Google Sheets
+    return gspread.authorize(credentials)
+
+
+# Cliente do processo; para testes basta trocar por ClienteSheets(autorizar=lambda: stub)
+CLIENTE_SHEETS = ClienteSheets()
+
+# Worker criado por fork (gunicorn com preload) abre as próprias conexões
+os.register_at_fork(after_in_child=CLIENTE_SHEETS.reiniciar)
+
+
+class FonteDados:
+    """
+    Interface das fontes de dados brutos.
+
+    Toda fonte devolve o mesmo esquema da aba "main" com os valores como texto (dtype=str),
+    para que o resultado passe pelo mesmo `tratar_dataframe`.
+    As implementações são dataclasses imutáveis: a própria fonte serve de chave do cache de snapshots.
+    """
+
+    # Se ler_a_partir_de busca só o intervalo pedido (fontes remotas). Quando é False, a fonte lê tudo
+    # de qualquer jeito, e a ingestão incremental confere também as linhas anteriores.
+    leitura_parcial = False
+
+    def ler(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def ler_a_partir_de(self, linha: int, colunas: list) -> pd.DataFrame:
+        """
+        Lê só as linhas de dados a partir da posição `linha` (0 = primeira linha abaixo do cabeçalho).
+
+        Usada pela ingestão incremental. Fontes locais leem o arquivo inteiro e descartam o início
+        (o ganho está em não tratar as linhas antigas); fontes remotas devem buscar só o intervalo novo.
+        Levanta EsquemaAlterado se o cabeçalho não for mais `colunas`.
+        """
+        df = self.ler()
+        if list(df.columns) != list(colunas):
+            raise EsquemaAlterado(f"Colunas mudaram em {self}")
+        return df.iloc[linha:].reset_index(drop=True)
+
+
+class EsquemaAlterado(Exception):
+    """
+    O cabeçalho da fonte mudou desde a última leitura completa.
+    """
+
+
+@dataclass(frozen=True)
+class FonteGoogleSheets(FonteDados):
+    """
+    Aba de uma planilha do Google Sheets, autenticada pela Service Account em GOOGLE_SERVICE_ACCOUNT.
+    """
+    sheet_id: str = SHEET_ID
+    nome_aba: str = NOME_ABA
+
+    leitura_parcial = True
+
+    def ler(self) -> pd.DataFrame:
+        from gspread_dataframe import get_as_dataframe
+
+        # Carrega a planilha como DataFrame
+        return self._com_aba(lambda worksheet: get_as_dataframe(worksheet, evaluate_formulas=True, dtype=str))
+
+    def ler_a_partir_de(self, linha: int, colunas: list) -> pd.DataFrame:
+        """
+        Busca só o cabeçalho e o intervalo a partir de `linha`, numa única chamada à API.
+        """
+        from gspread.utils import rowcol_to_a1
+
+        # Linha de dados 0 = linha 2 da planilha (a linha 1 é o cabeçalho)
+        ultima_coluna = rowcol_to_a1(1, len(colunas)).rstrip("0123456789")
+        intervalos = ["1:1", f"{rowcol_to_a1(linha + 2, 1)}:{ultima_coluna}"]
+        cabecalho, valores = self._com_aba(lambda worksheet: worksheet.batch_get(intervalos))
+
+        cabecalho = list(cabecalho[0]) if cabecalho else []
+        cabecalho += [""] * (len(colunas) - len(cabecalho))
+        for nome_atual, nome_lido in zip(cabecalho, colunas):
+            # Colunas sem nome viram "Unnamed: n" no get_as_dataframe
+            if not str(nome_lido).startswith("Unnamed") and nome_atual != nome_lido:
+                raise EsquemaAlterado(f"Colunas mudaram em {self}")
+
+        linhas = [list(valor) + [""] * (len(colunas) - len(valor)) for valor in valores]
+        df = pd.DataFrame(linhas, columns=list(colunas), dtype=object)
+        return df.where(df != "")
+
+    def _com_aba(self, operacao):
+        """
+        Executa a operação na aba em cache; se ela falhar, a aba é descartada e resolvida de novo na próxima vez.
+        """
+        try:
+            return operacao(CLIENTE_SHEETS.aba(self.sheet_id, self.nome_aba))
+        except Exception:
+            CLIENTE_SHEETS.descartar(self.sheet_id, self.nome_aba)
+            raise
+
+
+@dataclass(frozen=True)
+class FonteCSV(FonteDados):
+    """
+    Cópia local da aba em CSV (ex.: Arquivo > Fazer download > .csv).
+    """
+    caminho: str
+
+    def ler(self) -> pd.DataFrame:
+        return pd.read_csv(self.caminho, dtype=str)
+
+
+@dataclass(frozen=True)
+class FonteXLSX(FonteDados):
+    """
+    Cópia local da planilha em XLSX; `aba` aceita o nome ou o índice da aba.
+    """
+    caminho: str
+    aba: object = NOME_ABA
+
+    def ler(self) -> pd.DataFrame:
+        return pd.read_excel(self.caminho, sheet_name=self.aba, dtype=str, engine="openpyxl")
+
+
+@dataclass(frozen=True)
+class FonteParquet(FonteDados):
+    """
+    Cópia local em Parquet. Colunas tipadas são convertidas de volta para texto.
+    """
+    caminho: str
+
+    def ler(self) -> pd.DataFrame:
+        return _como_texto(pd.read_parquet(self.caminho))
+
+
+@dataclass(frozen=True)
+class FonteTemporadas(FonteDados):
+    """
+    Várias temporadas, cada uma na sua fonte (ex.: uma aba ou planilha por temporada), lidas em paralelo.
+
+    `temporadas` é uma tupla de pares (nome da temporada, FonteDados). Cada fonte é lida numa thread
+    de um pool limitado a `max_leituras` e recebe a coluna TEMPORADA; as partes são unidas num único DataFrame.
+    O tempo de leitura fica próximo ao da aba mais lenta, e não à soma de todas.
+    """
+    temporadas: tuple
+    max_leituras: int = MAX_LEITURAS_PARALELAS
+
+    def ler(self) -> pd.DataFrame:
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_leituras, len(self.temporadas)))) as pool:
+            partes = list(pool.map(_ler_temporada, self.temporadas))
+        return pd.concat(partes, ignore_index=True)
+
+
+def _ler_temporada(par: tuple) -> pd.DataFrame:
+    nome, fonte = par
+    df = fonte.ler()
+    df[COLUNA_TEMPORADA] = nome
+    return df
+
+
+def _como_texto(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte todas as colunas para texto, mantendo ausentes como NaN (equivalente a dtype=str).
+    """
+    return df.astype(object).where(df.isna(), df.astype(str))
+
+
+# Backends selecionáveis pela variável de ambiente FONTE_DADOS
+BACKENDS = {
+    "sheets": FonteGoogleSheets,
+    "csv": FonteCSV,
+    "xlsx": FonteXLSX,
+    "parquet": FonteParquet,
+}
+
+
+def fonte_configurada() -> FonteDados:
+    """
+    Monta a fonte a partir das variáveis de ambiente.
+
+    - FONTE_DADOS: "sheets" (padrão), "csv", "xlsx" ou "parquet"
+    - FONTE_DADOS_CAMINHO: arquivo local (obrigatório para os backends locais)
+    - FONTE_DADOS_ABA: aba do XLSX (padrão: "main")
+    - FONTE_DADOS_TEMPORADAS: várias temporadas, no formato "2024=<local>;2025=<local>", onde <local> é
+      "sheet_id" ou "sheet_id:aba" no backend "sheets" e o caminho do arquivo nos backends locais;
+      "<backend>:<local>" escolhe outro backend para a temporada (ex.: "2023=parquet:historico/2023")
+    """
+    backend = os.environ.get("FONTE_DADOS", "sheets").strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"FONTE_DADOS inválida: '{backend}'. Opções: {', '.join(BACKENDS)}")
+
+    temporadas = os.environ.get("FONTE_DADOS_TEMPORADAS", "").strip()
+    if temporadas:
+        pares = []
+        for item in filter(None, (parte.strip() for parte in temporadas.split(";"))):
+            nome, separador, local = item.partition("=")
+            if not separador or not nome.strip() or not local.strip():
+                raise ValueError(f"FONTE_DADOS_TEMPORADAS inválida: '{item}'. Formato: temporada=local")
+            pares.append((nome.strip(), _fonte_backend(backend, local.strip())))
+        return FonteTemporadas(tuple(pares))
+
+    if backend == "sheets":
+        return FonteGoogleSheets()
+
+    caminho = os.environ.get("FONTE_DADOS_CAMINHO")
+    if not caminho:
+        raise ValueError(f"FONTE_DADOS_CAMINHO é obrigatório para FONTE_DADOS='{backend}'")
+    return _fonte_backend(backend, caminho)
+
+
+def _fonte_backend(backend: str, local: str) -> FonteDados:
+    prefixo, separador, resto = local.partition(":")
+    if separador and prefixo.strip().lower() in BACKENDS:
+        backend, local = prefixo.strip().lower(), resto
+    if backend == "sheets":
+        sheet_id, _, nome_aba = local.partition(":")
+        return FonteGoogleSheets(sheet_id, nome_aba or NOME_ABA)
+    if backend == "xlsx":
+        return FonteXLSX(local, os.environ.get("FONTE_DADOS_ABA", NOME_ABA))
+    return BACKENDS[backend](local)
@@ -0,0 +1,246 @@
+"""
+Importação em lote de temporadas antigas a partir de exportações XLSX.
+
+A planilha é lida em modo streaming do openpyxl (read_only), em lotes de linhas: cada lote é validado,
+passa pelo `tratar_dataframe` e é gravado num dataset Parquet particionado por COMPETIÇÃO.
+A memória usada depende do tamanho do lote, não do tamanho da planilha.
+Linhas malformadas vão para um relatório CSV e não interrompem a importação.
+
+    python -m src.importador_xlsx temporada_2023.xlsx historico/2023 --aba main
+
+O dataset gerado é lido pela fonte Parquet, inclusive junto com a temporada atual:
+
+    FONTE_DADOS_TEMPORADAS="2023=parquet:historico/2023;2025=sheets:<sheet_id>"
+"""
+import os
+import csv
+import shutil
+import argparse
+import unicodedata
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+from src.data_loader import tratar_dataframe
+from src.fontes_dados import NOME_ABA
+
+# Colunas da aba "main", na ordem em que são gravadas
+COLUNAS_TEXTO = ['DATA', 'COMPETIÇÃO', 'PLAYER', 'POSIÇÃO', 'TIME']
+COLUNAS_NUMERO = ['RODADA', 'PARTIDA']
+COLUNAS_CONTAGEM = ['V', 'E', 'D', 'GOL', 'ASS', 'STG', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP', 'FALTA']
+
+# Sem estas colunas a planilha não é importada; sem estes valores a linha é rejeitada
+COLUNAS_OBRIGATORIAS = ['COMPETIÇÃO', 'RODADA', 'PARTIDA', 'PLAYER', 'POSIÇÃO', 'TIME']
+
+# Outros nomes de cabeçalho encontrados nas exportações antigas (já normalizados: sem acento, maiúsculos)
+SINONIMOS = {
+    'COMPETICAO': 'COMPETIÇÃO',
+    'POSICAO': 'POSIÇÃO',
+    'JOGADOR': 'PLAYER',
+    'GOLS': 'GOL',
+    'ASSISTENCIAS': 'ASS',
+    'ASSISTENCIA': 'ASS',
+    'FALTAS': 'FALTA',
+}
+
+# Partição do dataset gravado
+COLUNA_PARTICAO = 'COMPETIÇÃO'
+
+# Tipos gravados em todos os arquivos, para que os lotes formem um único dataset
+# (o tratar_dataframe escolhe int8 ou int16 conforme os valores de cada lote)
+ESQUEMA_ARQUIVO = pa.schema(
+    [(col, pa.string()) for col in COLUNAS_TEXTO]
+    + [(col, pa.int16()) for col in COLUNAS_NUMERO + COLUNAS_CONTAGEM]
+    + [('PTS', pa.float64())]
+)
+
+# Faixa aceita em RODADA, PARTIDA e nas contagens: a do int16 gravado (e do Int16 do tratar_dataframe)
+LIMITES_INTEIRO = np.iinfo(np.int16)
+
+LINHAS_POR_LOTE = 5000
+
+
+@dataclass
+class ResultadoImportacao:
+    linhas_lidas: int = 0
+    linhas_importadas: int = 0
+    linhas_rejeitadas: int = 0
+    colunas_ignoradas: list = field(default_factory=list)
+    relatorio: str = None
+
+
+def importar_xlsx(caminho: str, destino: str, aba: str = NOME_ABA, linhas_por_lote: int = LINHAS_POR_LOTE,
+                  relatorio: str = None) -> ResultadoImportacao:
+    """
+    Importa a aba `aba` do XLSX para o dataset Parquet em `destino` (substituído ao final, de forma atômica).
+
+    O relatório de linhas rejeitadas (linha da planilha, coluna, valor, motivo) vai para `relatorio`
+    (padrão: `<destino>.rejeitadas.csv`). Levanta ValueError se faltar alguma coluna obrigatória no cabeçalho.
+    """
+    relatorio = relatorio or f"{destino.rstrip(os.sep)}.rejeitadas.csv"
+    temporario = f"{destino.rstrip(os.sep)}.{os.getpid()}.tmp"
+    shutil.rmtree(temporario, ignore_errors=True)
+
+    livro = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        linhas = livro[aba].iter_rows(values_only=True)
+        cabecalho = next(linhas, None)
+        if cabecalho is None:
+            raise ValueError(f"Aba '{aba}' vazia em {caminho}")
+        posicoes, ignoradas = mapear_colunas(cabecalho)
+
+        resultado = ResultadoImportacao(colunas_ignoradas=ignoradas, relatorio=relatorio)
+        os.makedirs(os.path.dirname(relatorio) or '.', exist_ok=True)
+        with open(relatorio, 'w', newline='', encoding='utf-8') as arquivo_relatorio:
+            rejeitadas = csv.writer(arquivo_relatorio)
+            rejeitadas.writerow(['linha', 'coluna', 'valor', 'motivo'])
+
+            numero_lote = 0
+            for lote, numeros_linha in _lotes(linhas, posicoes, linhas_por_lote):
+                resultado.linhas_lidas += len(lote)
+                validas = validar_lote(lote, numeros_linha, rejeitadas)
+                resultado.linhas_rejeitadas += len(lote) - len(validas)
+                if validas.empty:
+                    continue
+
+                _gravar_lote(tratar_dataframe(validas.reset_index(drop=True)), temporario, numero_lote)
+                resultado.linhas_importadas += len(validas)
+                numero_lote += 1
+    finally:
+        livro.close()
+
+    if resultado.linhas_importadas == 0:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise ValueError(f"Nenhuma linha válida em {caminho} (veja {relatorio})")
+
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporario, destino)
+    return resultado
+
+
+def mapear_colunas(cabecalho: tuple):
+    """
+    Retorna ({coluna do schema: índice na planilha}, [cabeçalhos ignorados]).
+    """
+    conhecidas = {_normalizar(col): col for col in COLUNAS_TEXTO + COLUNAS_NUMERO + COLUNAS_CONTAGEM}
+    conhecidas.update(SINONIMOS)
+
+    posicoes, ignoradas = {}, []
+    for indice, nome in enumerate(cabecalho):
+        if nome is None or not str(nome).strip():
+            continue
+        coluna = conhecidas.get(_normalizar(nome))
+        if coluna is None or coluna in posicoes:
+            ignoradas.append(str(nome))
+        else:
+            posicoes[coluna] = indice
+
+    faltantes = [col for col in COLUNAS_OBRIGATORIAS if col not in posicoes]
+    if faltantes:
+        raise ValueError(f"Colunas obrigatórias ausentes no cabeçalho: {', '.join(faltantes)}")
+    return posicoes, ignoradas
+
+
+def validar_lote(lote: pd.DataFrame, numeros_linha: list, rejeitadas) -> pd.DataFrame:
+    """
+    Registra em `rejeitadas` (csv.writer) cada problema encontrado e devolve só as linhas válidas.
+    """
+    problemas = pd.Series(False, index=lote.index)
+
+    def registrar(mascara: pd.Series, coluna: str, motivo: str) -> None:
+        nonlocal problemas
+        for posicao in mascara[mascara].index:
+            rejeitadas.writerow([numeros_linha[posicao], coluna, lote.at[posicao, coluna], motivo])
+        problemas = problemas | mascara
+
+    for col in COLUNAS_OBRIGATORIAS:
+        registrar(lote[col].isna(), col, 'valor obrigatório ausente')
+
+    for col in COLUNAS_NUMERO + COLUNAS_CONTAGEM:
+        numeros = pd.to_numeric(lote[col], errors='coerce')
+        registrar(lote[col].notna() & numeros.isna(), col, 'valor não numérico')
+        registrar(numeros.notna() & (numeros != numeros.round()), col, 'valor não inteiro')
+        registrar(
+            (numeros < LIMITES_INTEIRO.min) | (numeros > LIMITES_INTEIRO.max), col,
+            f'valor fora da faixa ({LIMITES_INTEIRO.min} a {LIMITES_INTEIRO.max})'
+        )
+
+    return lote[~problemas]
+
+
+def _lotes(linhas, posicoes: dict, linhas_por_lote: int):
+    """
+    Agrupa as linhas do streaming do openpyxl em DataFrames de texto com as colunas do schema.
+    Linhas totalmente vazias são puladas. Devolve também o número de cada linha na planilha.
+    """
+    colunas = COLUNAS_TEXTO + COLUNAS_NUMERO + COLUNAS_CONTAGEM
+    valores, numeros_linha = [], []
+    # A linha 1 da planilha é o cabeçalho
+    for numero, linha in enumerate(linhas, start=2):
+        registro = [_como_texto(linha[posicoes[col]]) if col in posicoes and posicoes[col] < len(linha) else None
+                    for col in colunas]
+        if all(valor is None for valor in registro):
+            continue
+        valores.append(registro)
+        numeros_linha.append(numero)
+
+        if len(valores) == linhas_por_lote:
+            yield pd.DataFrame(valores, columns=colunas, dtype=object), numeros_linha
+            valores, numeros_linha = [], []
+
+    if valores:
+        yield pd.DataFrame(valores, columns=colunas, dtype=object), numeros_linha
+
+
+def _gravar_lote(df: pd.DataFrame, destino: str, numero_lote: int) -> None:
+    colunas = {
+        col: (df[col].astype(object).where(df[col].notna(), None) if col in COLUNAS_TEXTO else df[col])
+        for col in ESQUEMA_ARQUIVO.names
+    }
+    tabela = pa.Table.from_pandas(pd.DataFrame(colunas), schema=ESQUEMA_ARQUIVO, preserve_index=False)
+    pq.write_to_dataset(
+        tabela,
+        root_path=destino,
+        partition_cols=[COLUNA_PARTICAO],
+        basename_template=f"lote-{numero_lote:05d}-{{i}}.parquet",
+    )
+
+
+def _como_texto(valor):
+    """
+    Valor de célula como texto (equivalente ao dtype=str das outras fontes); vazio vira None.
+    """
+    if valor is None:
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    texto = str(valor).strip()
+    return texto or None
+
+
+def _normalizar(nome) -> str:
+    sem_acento = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode()
+    return sem_acento.strip().upper().replace(' ', '_')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('xlsx', help='planilha exportada')
+    parser.add_argument('destino', help='pasta do dataset Parquet (substituída ao final)')
+    parser.add_argument('--aba', default=NOME_ABA)
+    parser.add_argument('--linhas-por-lote', type=int, default=LINHAS_POR_LOTE)
+    parser.add_argument('--relatorio', help='CSV das linhas rejeitadas (padrão: <destino>.rejeitadas.csv)')
+    args = parser.parse_args()
+
+    resultado = importar_xlsx(args.xlsx, args.destino, args.aba, args.linhas_por_lote, args.relatorio)
+    print(f"Linhas lidas: {resultado.linhas_lidas}")
+    print(f"Linhas importadas: {resultado.linhas_importadas}")
+    print(f"Linhas rejeitadas: {resultado.linhas_rejeitadas} (relatório: {resultado.relatorio})")
+    if resultado.colunas_ignoradas:
+        print(f"Colunas ignoradas: {', '.join(resultado.colunas_ignoradas)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field
+from functools import cached_property
+import pandas as pd
+from src.data_loader import obter_snapshot, registrar_derivado_incremental, TODAS
+
+# Estatísticas exibidas nos cards do perfil
+COLUNAS_PERFIL = ['GOL', 'ASS', 'V', 'E', 'D', 'STG', 'GS', 'DD', 'DP']
+# Médias da competição comparadas no perfil
+COLUNAS_MEDIAS = ['GOL', 'ASS', 'V', 'E', 'D', 'STG']
+
+
+@dataclass
+class PerfilJogador:
+    """
+    Tudo o que a página de perfil mostra de um jogador, já recortado e somado.
+    """
+    linhas: pd.DataFrame            # linhas do jogador no DataFrame tratado
+    pts_por_rodada: pd.DataFrame    # RODADA, PTS (somados entre competições, como no gráfico)
+    totais: dict                    # somas de COLUNAS_PERFIL
+    posicao: str                    # POSIÇÃO da primeira linha do jogador
+
+
+@dataclass
+class IndiceJogadores:
+    """
+    Índice por jogador construído uma vez por snapshot: o perfil não depende mais do tamanho da liga.
+    """
+    perfis: dict            # PLAYER -> PerfilJogador
+    opcoes_dropdown: list   # [{"label", "value"}] em ordem alfabética
+    medias: dict            # médias por jogador de COLUNAS_MEDIAS (todas as competições)
+
+
+def obter_indice_jogadores(fonte=None, temporada: str = TODAS) -> IndiceJogadores:
+    return obter_snapshot(fonte).derivado('indice_jogadores', indexar_jogadores, temporada)
+
+
+def indexar_jogadores(df: pd.DataFrame) -> IndiceJogadores:
+    """
+    Monta o índice com agrupamentos únicos sobre o DataFrame inteiro (e não um filtro por jogador).
+    """
+    if df.empty:
+        return IndiceJogadores(perfis={}, opcoes_dropdown=[], medias={col: float('nan') for col in COLUNAS_MEDIAS})
+
+    df = df.dropna(subset=['PLAYER'])
+    grupos = df.groupby('PLAYER', observed=True, sort=True)
+
+    totais = grupos[COLUNAS_PERFIL].sum()
+    posicoes = grupos['POSIÇÃO'].first()
+    pts_por_rodada = df.groupby(['PLAYER', 'RODADA'], observed=True)['PTS'].sum().reset_index(level='RODADA')
+
+    perfis = {}
+    for jogador, posicoes_linhas in grupos.indices.items():
+        perfis[jogador] = PerfilJogador(
+            linhas=df.iloc[posicoes_linhas],
+            pts_por_rodada=pts_por_rodada.loc[[jogador]].reset_index(drop=True),
+            totais=totais.loc[jogador].to_dict(),
+            posicao=posicoes.loc[jogador],
+        )
+
+    return IndiceJogadores(
+        perfis=perfis,
+        opcoes_dropdown=[{"label": jogador, "value": jogador} for jogador in totais.index],
+        medias=totais[COLUNAS_MEDIAS].mean().round(2).to_dict(),
+    )
+
+
+# Critérios do gráfico de scout do Resumo da Rodada
+CRITERIOS_RODADA = ['GOL', 'ASS', 'FALTA', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP']
+
+
+@dataclass
+class ParticaoRodada:
+    """
+    Uma rodada de uma competição, com as somas por time e por jogador já agrupadas.
+
+    As tabelas no formato dos gráficos do Resumo da Rodada só são montadas no primeiro acesso:
+    uma renderização lê uma rodada e um critério, não todas as rodadas × CRITERIOS_RODADA.
+    """
+    linhas: pd.DataFrame        # linhas da rodada no DataFrame tratado
+    somas_time: pd.DataFrame    # TIME, V, E, D (resultados somados por time na rodada)
+    scout: pd.DataFrame         # PLAYER e CRITERIOS_RODADA somados por jogador na rodada
+    _criterios: dict = field(default_factory=dict, repr=False)
+
+    @cached_property
+    def ved(self) -> pd.DataFrame:
+        """
+        TIME, Resultado, Quantidade: V/E/D somados por time, no formato do gráfico.
+        """
+        return _como_texto(self.somas_time.melt(
+            id_vars='TIME', value_vars=['V', 'E', 'D'], var_name='Resultado', value_name='Quantidade'
+        ), 'TIME')
+
+    def criterio(self, criterio: str) -> pd.DataFrame:
+        """
+        PLAYER, critério: só os jogadores com valor > 0 na rodada.
+        """
+        tabela = self._criterios.get(criterio)
+        if tabela is None:
+            tabela = self.scout.loc[self.scout[criterio] > 0, ['PLAYER', criterio]].reset_index(drop=True)
+            self._criterios[criterio] = tabela
+        return tabela
+
+
+@dataclass
+class IndiceRodadas:
+    """
+    Dados particionados por (COMPETIÇÃO, RODADA), construído uma vez por snapshot.
+    """
+    particoes: dict     # (COMPETIÇÃO, RODADA) -> ParticaoRodada
+    rodadas: dict       # COMPETIÇÃO -> rodadas em ordem numérica
+
+    def particao(self, competicao: str, rodada: int):
+        return self.particoes.get((competicao, int(rodada)))
+
+
+def obter_indice_rodadas(fonte=None, temporada: str = TODAS) -> IndiceRodadas:
+    return obter_snapshot(fonte).derivado('indice_rodadas', particionar_rodadas, temporada)
+
+
+def particionar_rodadas(df: pd.DataFrame) -> IndiceRodadas:
+    """
+    Separa as linhas por (COMPETIÇÃO, RODADA) e agrupa as somas de todas as rodadas de uma vez;
+    cada partição recebe só a sua fatia (as tabelas dos gráficos saem dela quando são lidas).
+    """
+    if df.empty:
+        return IndiceRodadas(particoes={}, rodadas={})
+
+    df = df.assign(**{col: 0 for col in CRITERIOS_RODADA if col not in df.columns})
+    chaves = ['COMPETIÇÃO', 'RODADA']
+
+    # Resultado de cada time em cada partida (máximo entre as linhas dos jogadores) e soma na rodada
+    somas_time = _como_texto(
+        df.groupby(chaves + ['PARTIDA', 'TIME'], observed=True)[['V', 'E', 'D']].max()
+        .groupby(level=chaves + ['TIME'], observed=True).sum()
+        .reset_index(),
+        'TIME'
+    )
+    scout = _como_texto(df.groupby(chaves + ['PLAYER'], observed=True)[CRITERIOS_RODADA].sum().reset_index(), 'PLAYER')
+
+    somas_por_rodada = _fatias(somas_time, chaves)
+    scout_por_rodada = _fatias(scout, chaves)
+
+    particoes = {}
+    for (competicao, rodada), posicoes_linhas in df.groupby(chaves, observed=True).indices.items():
+        # Rodada só com linhas sem TIME/PLAYER não aparece nos agrupamentos: fica com tabelas vazias
+        particoes[(competicao, int(rodada))] = ParticaoRodada(
+            linhas=df.iloc[posicoes_linhas],
+            somas_time=somas_por_rodada.get((competicao, rodada), somas_time.iloc[:0]),
+            scout=scout_por_rodada.get((competicao, rodada), scout.iloc[:0]),
+        )
+
+    return IndiceRodadas(particoes=particoes, rodadas=_listar_rodadas(particoes))
+
+
+def mesclar_rodadas(indice: IndiceRodadas, df_novas: pd.DataFrame, df_completo: pd.DataFrame) -> IndiceRodadas:
+    """
+    Recalcula só as rodadas que receberam linhas novas; as demais partições são reaproveitadas.
+    """
+    chaves = ['COMPETIÇÃO', 'RODADA']
+    tocadas = pd.MultiIndex.from_frame(df_novas[chaves].drop_duplicates().astype(object))
+    linhas_tocadas = pd.MultiIndex.from_frame(df_completo[chaves].astype(object)).isin(tocadas)
+
+    particoes = {**indice.particoes, **particionar_rodadas(df_completo[linhas_tocadas]).particoes}
+    return IndiceRodadas(particoes=particoes, rodadas=_listar_rodadas(particoes))
+
+
+def _listar_rodadas(particoes: dict) -> dict:
+    rodadas = {}
+    for competicao, rodada in sorted(particoes):
+        rodadas.setdefault(competicao, []).append(rodada)
+    return rodadas
+
+
+def _fatias(tabela: pd.DataFrame, chaves: list) -> dict:
+    """
+    {chave: fatia da tabela (só TIME/PLAYER e as somas)}, cortada por posições a partir de um único groupby.
+    """
+    colunas = tabela.columns.drop(chaves)
+    return {
+        chave: tabela.iloc[posicoes][colunas].reset_index(drop=True)
+        for chave, posicoes in tabela.groupby(chaves, observed=True).indices.items()
+    }
+
+
+def _como_texto(tabela: pd.DataFrame, coluna: str) -> pd.DataFrame:
+    # Sem categorias nos gráficos: o plotly desenharia também as categorias ausentes da rodada
+    return tabela.astype({coluna: object}).reset_index(drop=True)
+
+
+# Recargas incrementais refazem só as rodadas que mudaram
+registrar_derivado_incremental('indice_rodadas', mesclar_rodadas)
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+import pandas as pd
+from src.data_loader import obter_snapshot, registrar_derivado_incremental, TODAS
+
+# A linha do tempo é por competição: rodadas de competições diferentes não se somam
+COMPETICAO_PADRAO = "LIGA"
+
+
+@dataclass
+class ClassificacaoRodadas:
+    """
+    Classificação de uma competição depois de cada rodada.
+    Tabelas largas: uma linha por RODADA (em ordem) e uma coluna por PLAYER.
+    """
+    pontos: pd.DataFrame        # PTS feitos na rodada (0 quando não jogou)
+    jogou: pd.DataFrame         # já tinha jogado até a rodada (inclusive)
+    acumulado: pd.DataFrame     # PTS acumulados até a rodada
+    colocacao: pd.DataFrame     # colocação pelos PTS acumulados (NaN antes da estreia)
+
+
+@dataclass
+class LinhaDoTempo:
+    competicoes: dict   # COMPETIÇÃO -> ClassificacaoRodadas
+
+    def trajetoria(self, competicao: str, jogador: str) -> pd.DataFrame:
+        """
+        RODADA, PTS acumulados e Colocação de um jogador, a partir da estreia.
+        """
+        classificacao = self.competicoes.get(competicao)
+        if classificacao is None or jogador not in classificacao.colocacao.columns:
+            return pd.DataFrame(columns=['RODADA', 'PTS', 'Colocação'])
+        estreou = classificacao.jogou[jogador]
+        return pd.DataFrame({
+            'RODADA': classificacao.colocacao.index[estreou.to_numpy()],
+            'PTS': classificacao.acumulado.loc[estreou, jogador].to_numpy(),
+            'Colocação': classificacao.colocacao.loc[estreou, jogador].astype(int).to_numpy(),
+        })
+
+    def evolucao(self, competicao: str, quantidade: int) -> pd.DataFrame:
+        """
+        RODADA, PLAYER, PTS acumulados e Colocação dos `quantidade` primeiros colocados da última rodada.
+        """
+        classificacao = self.competicoes.get(competicao)
+        if classificacao is None or classificacao.colocacao.empty:
+            return pd.DataFrame(columns=['RODADA', 'PLAYER', 'PTS', 'Colocação'])
+        lideres = classificacao.colocacao.iloc[-1].nsmallest(quantidade).index
+        colocacao = classificacao.colocacao[lideres].rename_axis('RODADA').rename_axis('PLAYER', axis=1)
+        evolucao = colocacao.stack().rename('Colocação').reset_index()
+        evolucao['PTS'] = classificacao.acumulado[lideres].stack().reindex(
+            pd.MultiIndex.from_frame(evolucao[['RODADA', 'PLAYER']])
+        ).to_numpy()
+        evolucao['Colocação'] = evolucao['Colocação'].astype(int)
+        return evolucao[['RODADA', 'PLAYER', 'PTS', 'Colocação']]
+
+
+def obter_linha_do_tempo(fonte=None, temporada: str = TODAS) -> LinhaDoTempo:
+    return obter_snapshot(fonte).derivado('linha_do_tempo', construir_linha_do_tempo, temporada)
+
+
+def construir_linha_do_tempo(df: pd.DataFrame) -> LinhaDoTempo:
+    """
+    Monta a classificação rodada a rodada de cada competição a partir do DataFrame tratado.
+    """
+    if df.empty:
+        return LinhaDoTempo(competicoes={})
+    return LinhaDoTempo(competicoes={
+        competicao: _classificar(pontos, jogou)
+        for competicao, (pontos, jogou) in _pontos_por_rodada(df).items()
+    })
+
+
+def estender_linha_do_tempo(linha: LinhaDoTempo, df_novas: pd.DataFrame, df_completo: pd.DataFrame) -> LinhaDoTempo:
+    """
+    Estende a linha do tempo com as linhas novas.
+
+    Para cada competição só as rodadas a partir da primeira rodada que recebeu linhas são recalculadas
+    (a rodada em andamento costuma receber linhas em várias recargas); o acumulado continua do ponto
+    em que a rodada anterior parou, então as rodadas antigas não são reclassificadas.
+    """
+    if df_novas.empty:
+        return linha
+
+    competicoes = dict(linha.competicoes)
+    primeiras = df_novas.dropna(subset=['RODADA']).groupby('COMPETIÇÃO', observed=True)['RODADA'].min()
+    for competicao, primeira in primeiras.items():
+        linhas_afetadas = df_completo[(df_completo['COMPETIÇÃO'] == competicao) & (df_completo['RODADA'] >= primeira)]
+        novas = _pontos_por_rodada(linhas_afetadas).get(competicao)
+        anterior = competicoes.get(competicao)
+        if novas is None:
+            continue
+        if anterior is None:
+            competicoes[competicao] = _classificar(*novas)
+            continue
+
+        pontos, jogou = novas
+        manter = anterior.pontos.index < primeira
+        jogadores = anterior.pontos.columns.union(pontos.columns)
+
+        # Ponto de partida: acumulado e estreias até a rodada anterior à primeira afetada
+        base_acumulado = anterior.acumulado.loc[manter].reindex(columns=jogadores, fill_value=0).iloc[-1:]
+        base_jogou = anterior.jogou.loc[manter].reindex(columns=jogadores, fill_value=False).iloc[-1:]
+
+        competicoes[competicao] = _classificar(
+            pontos.reindex(columns=jogadores, fill_value=0),
+            jogou.reindex(columns=jogadores, fill_value=False),
+            base_acumulado.to_numpy()[0] if len(base_acumulado) else None,
+            base_jogou.to_numpy()[0] if len(base_jogou) else None,
+            anterior=anterior,
+            manter=manter,
+        )
+
+    return LinhaDoTempo(competicoes=competicoes)
+
+
+def _pontos_por_rodada(df: pd.DataFrame) -> dict:
+    """
+    {COMPETIÇÃO: (pontos, jogou)} com uma linha por RODADA e uma coluna por PLAYER.
+    """
+    somas = df.groupby(['COMPETIÇÃO', 'RODADA', 'PLAYER'], observed=True)['PTS'].sum()
+    resultado = {}
+    for competicao, serie in somas.groupby(level='COMPETIÇÃO', observed=True):
+        pontos = serie.droplevel('COMPETIÇÃO').unstack('PLAYER')
+        pontos.columns = pontos.columns.astype(object)
+        pontos.index = pontos.index.astype(int)
+        resultado[competicao] = (pontos.fillna(0), pontos.notna())
+    return resultado
+
+
+def _classificar(pontos: pd.DataFrame, jogou: pd.DataFrame, base_acumulado=None, base_jogou=None,
+                 anterior: ClassificacaoRodadas = None, manter=None) -> ClassificacaoRodadas:
+    """
+    Acumula e classifica as rodadas de `pontos`, continuando de `base_acumulado`/`base_jogou`
+    (valores por jogador ao fim da rodada anterior). Com `anterior`, as rodadas `manter` são reaproveitadas.
+    """
+    acumulado = pontos.cumsum()
+    jogou = jogou.cummax()
+    if base_acumulado is not None:
+        acumulado = acumulado + base_acumulado
+        jogou = jogou | base_jogou
+
+    # Só quem já estreou entra na classificação da rodada
+    colocacao = acumulado.where(jogou).rank(axis=1, ascending=False, method='min')
+    novas = ClassificacaoRodadas(pontos=pontos, jogou=jogou, acumulado=acumulado, colocacao=colocacao)
+    if anterior is None:
+        return novas
+
+    colunas = pontos.columns
+    return ClassificacaoRodadas(
+        pontos=pd.concat([anterior.pontos.loc[manter].reindex(columns=colunas, fill_value=0), novas.pontos]),
+        jogou=pd.concat([anterior.jogou.loc[manter].reindex(columns=colunas, fill_value=False), novas.jogou]),
+        acumulado=pd.concat([anterior.acumulado.loc[manter].reindex(columns=colunas, fill_value=0), novas.acumulado]),
+        colocacao=pd.concat([anterior.colocacao.loc[manter].reindex(columns=colunas), novas.colocacao]),
+    )
+
+
+# Recargas incrementais estendem a linha do tempo a partir da primeira rodada afetada
+registrar_derivado_incremental('linha_do_tempo', estender_linha_do_tempo)
@@ -0,0 +1,203 @@
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# Limites (em segundos) dos buckets dos histogramas de latência
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Métricas expostas em /metrics: nome -> (tipo, descrição)
+METRICAS = {
+    'mrleague_callback_segundos': ('histogram', 'Duração das requisições de callback do Dash, por saída'),
+    'mrleague_fonte_leitura_segundos': ('histogram', 'Duração da leitura da fonte de dados (ex.: Google Sheets), por tipo de carga'),
+    'mrleague_tratamento_segundos': ('histogram', 'Duração do tratar_dataframe, por tipo de carga'),
+    'mrleague_derivado_segundos': ('histogram', 'Duração da construção de estruturas derivadas do snapshot'),
+    'mrleague_carga_erros_total': ('counter', 'Cargas da fonte de dados que falharam'),
+    'mrleague_cache_total': ('counter', 'Consultas aos caches, por cache e resultado'),
+    'mrleague_snapshot_linhas': ('gauge', 'Linhas do snapshot atual'),
+    'mrleague_snapshot_versao': ('gauge', 'Versão do snapshot atual'),
+}
+
+# Ativa o perfilador por amostragem (cabeçalho X-Perfil: 1 ou cookie perfil=1 na requisição)
+PERFIL_HABILITADO = os.environ.get("METRICAS_PERFIL_HABILITADO") == "1"
+PASTA_PERFIS = os.environ.get("METRICAS_PERFIL_PASTA", "perfis")
+INTERVALO_AMOSTRAGEM = float(os.environ.get("METRICAS_PERFIL_INTERVALO", "0.005"))
+
+_lock = threading.Lock()
+_contadores = {}    # (nome, rótulos) -> valor
+_medidores = {}     # (nome, rótulos) -> valor
+_histogramas = {}   # (nome, rótulos) -> [contagens por bucket..., soma, total]
+
+
+def _reiniciar_apos_fork() -> None:
+    # Um lock preso por outra thread do processo pai no momento do fork nunca seria liberado no filho
+    global _lock
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reiniciar_apos_fork)
+
+
+def _chave(nome: str, rotulos: dict) -> tuple:
+    return nome, tuple(sorted(rotulos.items()))
+
+
+def incrementar(nome: str, valor: float = 1, **rotulos) -> None:
+    with _lock:
+        chave = _chave(nome, rotulos)
+        _contadores[chave] = _contadores.get(chave, 0) + valor
+
+
+def definir(nome: str, valor: float, **rotulos) -> None:
+    with _lock:
+        _medidores[_chave(nome, rotulos)] = valor
+
+
+def observar(nome: str, valor: float, **rotulos) -> None:
+    with _lock:
+        chave = _chave(nome, rotulos)
+        if chave not in _histogramas:
+            _histogramas[chave] = [0] * len(BUCKETS_SEGUNDOS) + [0.0, 0]
+        serie = _histogramas[chave]
+        for i, limite in enumerate(BUCKETS_SEGUNDOS):
+            if valor <= limite:
+                serie[i] += 1
+        serie[-2] += valor
+        serie[-1] += 1
+
+
+@contextmanager
+def cronometro(nome: str, **rotulos):
+    """
+    Observa no histograma `nome` a duração do bloco.
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar(nome, time.perf_counter() - inicio, **rotulos)
+
+
+def texto_prometheus() -> str:
+    """
+    Todas as métricas no formato de texto do Prometheus.
+    """
+    with _lock:
+        contadores, medidores = dict(_contadores), dict(_medidores)
+        histogramas = {chave: list(serie) for chave, serie in _histogramas.items()}
+
+    linhas = []
+    for nome, (tipo, ajuda) in METRICAS.items():
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        if tipo == 'histogram':
+            for (nome_serie, rotulos), serie in sorted(histogramas.items()):
+                if nome_serie != nome:
+                    continue
+                for limite, quantidade in zip(BUCKETS_SEGUNDOS, serie):
+                    linhas.append(f"{nome}_bucket{_rotulos(rotulos, le=limite)} {quantidade}")
+                linhas.append(f"{nome}_bucket{_rotulos(rotulos, le='+Inf')} {serie[-1]}")
+                linhas.append(f"{nome}_sum{_rotulos(rotulos)} {serie[-2]}")
+                linhas.append(f"{nome}_count{_rotulos(rotulos)} {serie[-1]}")
+        else:
+            series = contadores if tipo == 'counter' else medidores
+            for (nome_serie, rotulos), valor in sorted(series.items()):
+                if nome_serie == nome:
+                    linhas.append(f"{nome}{_rotulos(rotulos)} {valor}")
+    return "\n".join(linhas) + "\n"
+
+
+def _rotulos(rotulos: tuple, **extras) -> str:
+    pares = list(rotulos) + list(extras.items())
+    if not pares:
+        return ""
+    return "{" + ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in pares) + "}"
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class AmostradorPilha:
+    """
+    Perfilador por amostragem de uma thread: a cada intervalo registra a pilha em execução.
+    O resultado sai no formato "collapsed stacks" (uma pilha por linha + contagem), lido por flamegraph/speedscope.
+    """
+
+    def __init__(self, id_thread: int, intervalo: float = INTERVALO_AMOSTRAGEM):
+        self.id_thread = id_thread
+        self.intervalo = intervalo
+        self.amostras = Counter()
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+
+    def iniciar(self) -> "AmostradorPilha":
+        self._thread.start()
+        return self
+
+    def parar(self) -> str:
+        self._parar.set()
+        self._thread.join()
+        return "\n".join(f"{pilha} {quantidade}" for pilha, quantidade in self.amostras.most_common()) + "\n"
+
+    def _executar(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            frame = sys._current_frames().get(self.id_thread)
+            pilha = []
+            while frame is not None:
+                codigo = frame.f_code
+                pilha.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if pilha:
+                self.amostras[";".join(reversed(pilha))] += 1
+
+
+def instrumentar(server) -> None:
+    """
+    Liga a instrumentação no servidor Flask do Dash:
+    - duração de cada requisição de callback (/_dash-update-component), rotulada pelas saídas do callback;
+    - rota /metrics no formato do Prometheus;
+    - perfilador por amostragem opcional por requisição (METRICAS_PERFIL_HABILITADO=1).
+    """
+    from flask import Response, g, request
+
+    @server.before_request
+    def _iniciar_medicao():
+        if not request.path.endswith('/_dash-update-component'):
+            return
+        g.metricas_inicio = time.perf_counter()
+        if PERFIL_HABILITADO and (request.headers.get('X-Perfil') == '1' or request.cookies.get('perfil') == '1'):
+            g.metricas_amostrador = AmostradorPilha(threading.get_ident()).iniciar()
+
+    @server.after_request
+    def _registrar_medicao(resposta):
+        inicio = g.pop('metricas_inicio', None)
+        if inicio is None:
+            return resposta
+
+        corpo = request.get_json(silent=True) or {}
+        saida = str(corpo.get('output', 'desconhecida'))
+        observar('mrleague_callback_segundos', time.perf_counter() - inicio, saida=saida, status=resposta.status_code)
+
+        amostrador = g.pop('metricas_amostrador', None)
+        if amostrador is not None:
+            os.makedirs(PASTA_PERFIS, exist_ok=True)
+            nome_saida = "".join(c if c.isalnum() else "_" for c in saida).strip("_")[:80]
+            caminho = os.path.join(PASTA_PERFIS, f"{time.strftime('%Y%m%d-%H%M%S')}_{nome_saida}.txt")
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.write(amostrador.parar())
+            resposta.headers['X-Perfil-Arquivo'] = caminho
+        return resposta
+
+    @server.teardown_request
+    def _encerrar_amostrador(_erro):
+        # Requisição que terminou em exceção não passa pelo after_request
+        amostrador = g.pop('metricas_amostrador', None)
+        if amostrador is not None:
+            amostrador.parar()
+
+    @server.route('/metrics')
+    def metrics():
+        return Response(texto_prometheus(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+
+def compilar_criterios(criterios: dict):
+    """
+    Converte o dicionário de critérios em uma matriz de pesos posição × estatística.
+
+    Retorna (posicoes, colunas, pesos, fracionarios):
+    - posicoes: posições na ordem das linhas da matriz
+    - colunas: estatísticas na ordem das colunas da matriz
+    - pesos: matriz float com uma linha extra de zeros no final (posição desconhecida)
+    - fracionarios: para cada linha, se a posição tem algum peso float (resultado em float, como no sum() do Python)
+    """
+    posicoes = list(criterios)
+    colunas = _colunas([criterios])
+    pesos, fracionarios = _matriz_pesos(criterios, posicoes, colunas)
+    return posicoes, colunas, pesos, fracionarios
+
+
+def _colunas(lista_criterios: list) -> list:
+    colunas = []
+    for criterios in lista_criterios:
+        for pesos_posicao in criterios.values():
+            for col in pesos_posicao:
+                if col not in colunas:
+                    colunas.append(col)
+    return colunas
+
+
+def _matriz_pesos(criterios: dict, posicoes: list, colunas: list):
+    """
+    Matriz de pesos de `criterios` nas linhas `posicoes` (+ linha de zeros) e colunas `colunas` dadas.
+    Posições e estatísticas ausentes em `criterios` ficam com peso 0.
+    """
+    pesos = np.zeros((len(posicoes) + 1, len(colunas)), dtype=np.float64)
+    fracionarios = np.zeros(len(posicoes) + 1, dtype=bool)
+    for i, posicao in enumerate(posicoes):
+        for col, peso in criterios.get(posicao, {}).items():
+            pesos[i, colunas.index(col)] = peso
+            fracionarios[i] |= isinstance(peso, float)
+    return pesos, fracionarios
+
+
+def indice_posicoes(posicoes_df: pd.Series, posicoes: list) -> np.ndarray:
+    """
+    Converte a coluna POSIÇÃO no índice da linha de pesos (posição desconhecida -> última linha, só zeros).
+    """
+    codigos = pd.Index(posicoes).get_indexer(pd.Series(posicoes_df).astype(object))
+    return np.where(codigos < 0, len(posicoes), codigos)
+
+
+def calcular_pontos(df: pd.DataFrame, criterios: dict) -> pd.Series:
+    """
+    Calcula a coluna PTS com um único produto de matrizes (estatísticas × pesos por posição).
+
+    Produz exatamente os mesmos valores do cálculo linha a linha: os pesos são múltiplos de 0.5
+    e as contagens são inteiras, então toda soma parcial é representável sem arredondamento em float64.
+    O tipo também é preservado: int quando nenhuma linha usa pesos fracionários, float caso contrário.
+    """
+    posicoes, colunas, pesos, fracionarios = compilar_criterios(criterios)
+
+    indice = indice_posicoes(df['POSIÇÃO'], posicoes)
+    estatisticas = df[colunas].to_numpy(dtype=np.float64)
+
+    # (linhas × estatísticas) @ (estatísticas × posições): pontos de cada linha em cada posição
+    pontos_por_posicao = estatisticas @ pesos.T
+    pontos = pontos_por_posicao[np.arange(len(df)), indice]
+
+    if not fracionarios[indice].any():
+        pontos = pontos.astype(np.int64)
+
+    return pd.Series(pontos, index=df.index, name='PTS')
+
+
+def simular_cenarios(estatisticas: pd.DataFrame, cenarios: dict, criterios_atuais: dict) -> dict:
+    """
+    Avalia vários conjuntos de critérios ("e se...") de uma vez e compara com os critérios atuais.
+
+    `estatisticas` tem PLAYER, POSIÇÃO e as contagens (linhas do DataFrame tratado ou totais já somados:
+    os pontos são lineares nas contagens, então somar antes de pontuar dá o mesmo resultado).
+    `cenarios` é {nome: critérios no formato de CRITERIOS}.
+
+    Todos os cenários são calculados num único produto tensorial (cenário × posição × estatística),
+    sobre as contagens somadas por (PLAYER, POSIÇÃO). Retorna {nome: classificação}, cada uma com
+    PLAYER, PTS, Colocação, PTS atual, Colocação atual e Variação (posições ganhas; negativo = perdeu),
+    ordenada pela nova colocação.
+    """
+    nomes = list(cenarios)
+    todos = [criterios_atuais] + [cenarios[nome] for nome in nomes]
+    posicoes = list(dict.fromkeys(posicao for criterios in todos for posicao in criterios))
+    colunas = _colunas(todos)
+
+    # Contagens somadas por (PLAYER, POSIÇÃO): o tamanho do cálculo é o número de jogadores, não de linhas
+    estatisticas = estatisticas.dropna(subset=['PLAYER']).assign(
+        **{col: 0 for col in colunas if col not in estatisticas.columns}
+    )
+    somas = estatisticas.groupby(['PLAYER', 'POSIÇÃO'], observed=True, dropna=False)[colunas].sum()
+    jogadores = somas.index.get_level_values('PLAYER')
+    indice = indice_posicoes(somas.index.get_level_values('POSIÇÃO'), posicoes)
+
+    # (cenários × posições × estatísticas), com os critérios atuais no cenário 0
+    pesos = np.stack([_matriz_pesos(criterios, posicoes, colunas)[0] for criterios in todos])
+    # pontos[c, g] = contagens do grupo g · pesos do cenário c na posição do grupo g
+    pontos = np.einsum('gs,cgs->gc', somas.to_numpy(dtype=np.float64), pesos[:, indice, :])
+
+    por_jogador = pd.DataFrame(pontos, index=jogadores).groupby(level=0, observed=True).sum()
+    colocacoes = por_jogador.rank(ascending=False, method='min').astype(int)
+
+    resultado = {}
+    for i, nome in enumerate(nomes, start=1):
+        classificacao = pd.DataFrame({
+            'PLAYER': por_jogador.index.astype(object),
+            'PTS': por_jogador[i].to_numpy(),
+            'Colocação': colocacoes[i].to_numpy(),
+            'PTS atual': por_jogador[0].to_numpy(),
+            'Colocação atual': colocacoes[0].to_numpy(),
+        })
+        classificacao['Variação'] = classificacao['Colocação atual'] - classificacao['Colocação']
+        resultado[nome] = classificacao.sort_values(['Colocação', 'PLAYER']).reset_index(drop=True)
+    return resultado
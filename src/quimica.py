@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src.data_loader import obter_snapshot, TODAS
+
+# Uma "partida do time": o lado de um TIME numa PARTIDA (quem esteve nela jogou junto)
+COLUNAS_PARTIDA_TIME = ['COMPETIÇÃO', 'RODADA', 'PARTIDA', 'TIME']
+
+# Mínimo de partidas juntos para um parceiro entrar na lista e no mapa de calor
+MINIMO_PARTIDAS_JUNTOS = 3
+
+
+@dataclass
+class Quimica:
+    """
+    Números de cada par de jogadores nas partidas em que estiveram no mesmo time.
+    Matrizes esparsas jogadores × jogadores, na ordem de `jogadores`; a diagonal é o próprio jogador.
+    """
+    jogadores: np.ndarray   # PLAYER de cada linha/coluna (ordem alfabética)
+    linhas: dict            # PLAYER -> linha
+    juntos: object          # partidas no mesmo time
+    vitorias: object        # V nessas partidas
+    empates: object         # E nessas partidas
+    derrotas: object        # D nessas partidas
+    pts: object             # pts[i, j] = PTS feitos por i nas partidas com j
+
+    def parceiros(self, jogador: str, minimo_partidas: int = MINIMO_PARTIDAS_JUNTOS) -> pd.DataFrame:
+        """
+        Companheiros de time do jogador com o retrospecto juntos, do melhor aproveitamento para o pior.
+        """
+        colunas = ['PARCEIRO', 'Partidas', 'V', 'E', 'D', 'Aproveitamento', 'PTS por partida']
+        linha = self.linhas.get(jogador)
+        if linha is None:
+            return pd.DataFrame(columns=colunas)
+
+        # Só as colunas não nulas da linha: quem nunca jogou junto nem entra no cálculo
+        juntos = self.juntos.getrow(linha)
+        indices, partidas = juntos.indices, juntos.data
+        manter = (indices != linha) & (partidas >= minimo_partidas)
+        indices, partidas = indices[manter], partidas[manter]
+
+        vitorias = self.vitorias.getrow(linha).toarray().ravel()[indices]
+        empates = self.empates.getrow(linha).toarray().ravel()[indices]
+        parceiros = pd.DataFrame({
+            'PARCEIRO': self.jogadores[indices],
+            'Partidas': partidas.astype(int),
+            'V': vitorias.astype(int),
+            'E': empates.astype(int),
+            'D': self.derrotas.getrow(linha).toarray().ravel()[indices].astype(int),
+            'Aproveitamento': _aproveitamento(vitorias, empates, partidas).round(1),
+            'PTS por partida': (self.pts.getrow(linha).toarray().ravel()[indices] / partidas).round(1),
+        }, columns=colunas)
+        return parceiros.sort_values(['Aproveitamento', 'Partidas'], ascending=False, ignore_index=True)
+
+    def aproveitamento_entre(self, jogadores: list) -> pd.DataFrame:
+        """
+        Aproveitamento (%) de cada par dos `jogadores` quando jogaram juntos (NaN se nunca jogaram),
+        no formato do mapa de calor. A diagonal é o aproveitamento do próprio jogador.
+        """
+        jogadores = [jogador for jogador in jogadores if jogador in self.linhas]
+        indices = [self.linhas[jogador] for jogador in jogadores]
+        juntos = _recortar(self.juntos, indices)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            valores = _aproveitamento(_recortar(self.vitorias, indices), _recortar(self.empates, indices), juntos)
+        valores[juntos == 0] = np.nan
+        return pd.DataFrame(valores.round(1), index=jogadores, columns=jogadores)
+
+
+def obter_quimica(fonte=None, temporada: str = TODAS) -> Quimica:
+    return obter_snapshot(fonte).derivado('quimica', construir_quimica, temporada)
+
+
+def construir_quimica(df: pd.DataFrame) -> Quimica:
+    """
+    Monta a matriz de incidência esparsa jogadores × partidas do time e obtém todos os pares
+    num único produto esparso:
+
+        incidência @ [incidência; incidência·V; incidência·E; incidência·D; PTS]ᵀ
+
+    cujos blocos são partidas juntos, V, E e D juntos e PTS do parceiro. Nenhum laço sobre pares.
+    """
+    # scipy importado só quando a química é montada (não na importação do app)
+    import scipy.sparse as sp
+
+    colunas = COLUNAS_PARTIDA_TIME + ['PLAYER', 'V', 'E', 'D', 'PTS']
+    if df.empty or any(col not in df.columns for col in colunas):
+        return _quimica_vazia(sp)
+    df = df.dropna(subset=COLUNAS_PARTIDA_TIME + ['PLAYER'])
+    if df.empty:
+        return _quimica_vazia(sp)
+
+    codigos_jogador, jogadores = pd.factorize(df['PLAYER'].astype(object), sort=True)
+    codigos_partida = df.groupby(COLUNAS_PARTIDA_TIME, observed=True, sort=False).ngroup().to_numpy()
+    total_jogadores, total_partidas = len(jogadores), int(codigos_partida.max()) + 1
+
+    # Resultado do time em cada partida (máximo entre as linhas dos jogadores, como no Resumo da Rodada)
+    resultados = df[['V', 'E', 'D']].groupby(codigos_partida).max().reindex(range(total_partidas), fill_value=0)
+
+    # Uma entrada por (jogador, partida do time); linhas repetidas do mesmo jogador somam os PTS
+    entradas = (
+        pd.DataFrame({'jogador': codigos_jogador, 'partida': codigos_partida, 'PTS': df['PTS'].to_numpy(dtype=np.float64)})
+        .groupby(['jogador', 'partida'], sort=False)['PTS'].sum()
+        .reset_index()
+    )
+    posicoes = (entradas['jogador'].to_numpy(), entradas['partida'].to_numpy())
+    forma = (total_jogadores, total_partidas)
+    incidencia = sp.csr_matrix((np.ones(len(entradas)), posicoes), shape=forma)
+    pts = sp.csr_matrix((entradas['PTS'].to_numpy(), posicoes), shape=forma)
+
+    # Cada resultado pesa as colunas da incidência (1 nas partidas do time com aquele resultado)
+    por_resultado = [incidencia @ sp.diags(resultados[col].to_numpy(dtype=np.float64)) for col in ['V', 'E', 'D']]
+    produto = (incidencia @ sp.vstack([incidencia, *por_resultado, pts]).T).tocsc()
+
+    blocos = [produto[:, inicio:inicio + total_jogadores].tocsr() for inicio in range(0, 5 * total_jogadores, total_jogadores)]
+    juntos, vitorias, empates, derrotas, pts_do_parceiro = blocos
+
+    jogadores = np.asarray(jogadores, dtype=object)
+    return Quimica(
+        jogadores=jogadores,
+        linhas={jogador: linha for linha, jogador in enumerate(jogadores)},
+        juntos=juntos,
+        vitorias=vitorias,
+        empates=empates,
+        derrotas=derrotas,
+        # O bloco traz os PTS do parceiro (coluna) nas partidas com o jogador (linha): transposto, os do próprio jogador
+        pts=pts_do_parceiro.T.tocsr(),
+    )
+
+
+def _quimica_vazia(sp) -> Quimica:
+    vazia = sp.csr_matrix((0, 0))
+    return Quimica(jogadores=np.array([], dtype=object), linhas={}, juntos=vazia,
+                   vitorias=vazia, empates=vazia, derrotas=vazia, pts=vazia)
+
+
+def _aproveitamento(vitorias, empates, partidas):
+    """
+    Percentual dos pontos possíveis (3 por vitória, 1 por empate).
+    """
+    return 100 * (3 * vitorias + empates) / (3 * partidas)
+
+
+def _recortar(matriz, indices: list) -> np.ndarray:
+    return matriz[indices][:, indices].toarray()
@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src.data_loader import obter_snapshot, TODAS
+
+# Estatísticas que formam o perfil de cada jogador (médias por partida)
+COLUNAS_SIMILARIDADE = ['GOL', 'ASS', 'STG', 'V', 'E', 'D', 'GC', 'AMA', 'AZUL', 'VER', 'PP', 'GS', 'DD', 'DP', 'PTS']
+
+# Quantidade padrão de jogadores parecidos e mínimo de partidas para aparecer como vizinho
+# (com uma ou duas partidas as médias são só ruído)
+K_SIMILARES = 5
+MINIMO_PARTIDAS = 3
+
+# Consultas por lote no cálculo das distâncias (limita a matriz consultas × jogadores em memória)
+CONSULTAS_POR_LOTE = 1024
+
+
+@dataclass
+class MatrizSimilaridade:
+    """
+    Perfis dos jogadores de uma competição como vetores: médias por partida de COLUNAS_SIMILARIDADE,
+    padronizadas (z-score) entre os jogadores da competição, uma linha por PLAYER.
+    """
+    jogadores: np.ndarray   # PLAYER de cada linha
+    posicoes: np.ndarray    # POSIÇÃO de cada linha
+    partidas: np.ndarray    # partidas jogadas na competição
+    vetores: np.ndarray     # float32, jogadores × COLUNAS_SIMILARIDADE
+    normas: np.ndarray      # |vetor|² de cada linha (pré-calculado para as distâncias)
+    linhas: dict            # PLAYER -> linha
+
+    def vizinhos(self, jogadores: list, k: int = K_SIMILARES, mesma_posicao: bool = True,
+                 minimo_partidas: int = MINIMO_PARTIDAS) -> dict:
+        """
+        {PLAYER: DataFrame com os k jogadores mais próximos} para todos os `jogadores` de uma vez.
+
+        As distâncias euclidianas saem de um único produto de matrizes por lote de consultas
+        (|a - b|² = |a|² + |b|² - 2·a·b) e os k menores de cada linha vêm do argpartition, sem ordenar a linha toda.
+        Jogadores fora da matriz são ignorados.
+        """
+        consultas = np.array([self.linhas[jogador] for jogador in jogadores if jogador in self.linhas], dtype=np.intp)
+        resultado = {}
+        if len(consultas) == 0 or k <= 0:
+            return resultado
+
+        k = min(k, len(self.jogadores))
+        candidatos_invalidos = self.partidas < minimo_partidas
+        for inicio in range(0, len(consultas), CONSULTAS_POR_LOTE):
+            lote = consultas[inicio:inicio + CONSULTAS_POR_LOTE]
+            distancias = self.normas[lote, None] + self.normas[None, :] - 2 * (self.vetores[lote] @ self.vetores.T)
+            np.maximum(distancias, 0, out=distancias)
+
+            # Fora da disputa: o próprio jogador, quem jogou pouco e (opcionalmente) outras posições
+            distancias[:, candidatos_invalidos] = np.inf
+            distancias[np.arange(len(lote)), lote] = np.inf
+            if mesma_posicao:
+                distancias[self.posicoes[lote, None] != self.posicoes[None, :]] = np.inf
+
+            melhores = np.argpartition(distancias, k - 1, axis=1)[:, :k]
+            melhores_distancias = np.take_along_axis(distancias, melhores, axis=1)
+            ordem = np.argsort(melhores_distancias, axis=1)
+            melhores = np.take_along_axis(melhores, ordem, axis=1)
+            melhores_distancias = np.sqrt(np.take_along_axis(melhores_distancias, ordem, axis=1))
+
+            for linha, indices, distancia in zip(lote, melhores, melhores_distancias):
+                validos = np.isfinite(distancia)
+                resultado[self.jogadores[linha]] = self._tabela(indices[validos], distancia[validos])
+
+        return resultado
+
+    def _tabela(self, indices: np.ndarray, distancias: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame({
+            'PLAYER': self.jogadores[indices],
+            'POSIÇÃO': self.posicoes[indices],
+            'PARTIDAS': self.partidas[indices],
+            'Distância': distancias.round(2),
+            # 100% = mesmo perfil; um par qualquer de jogadores fica em torno de 37% (|a - b|² ≈ 2 × colunas)
+            'Similaridade': (100 * np.exp(-distancias ** 2 / (2 * self.vetores.shape[1]))).round(1),
+        })
+
+
+@dataclass
+class Similaridade:
+    competicoes: dict   # COMPETIÇÃO (inclusive "Todas") -> MatrizSimilaridade
+
+    def similares(self, jogador: str, competicao: str = TODAS, k: int = K_SIMILARES, mesma_posicao: bool = True) -> pd.DataFrame:
+        matriz = self.competicoes.get(competicao)
+        vizinhos = matriz.vizinhos([jogador], k, mesma_posicao) if matriz is not None else {}
+        return vizinhos.get(jogador, pd.DataFrame(columns=['PLAYER', 'POSIÇÃO', 'PARTIDAS', 'Distância', 'Similaridade']))
+
+
+def obter_similaridade(fonte=None, temporada: str = TODAS) -> Similaridade:
+    return obter_snapshot(fonte).derivado('similaridade', construir_similaridade, temporada)
+
+
+def construir_similaridade(df: pd.DataFrame) -> Similaridade:
+    """
+    Monta a matriz de perfis de cada competição (e de todas juntas) com um único agrupamento por (COMPETIÇÃO, PLAYER).
+    """
+    if df.empty:
+        return Similaridade(competicoes={})
+
+    df = df.dropna(subset=['PLAYER'])
+    if df.empty:
+        return Similaridade(competicoes={})
+    df = df.assign(PARTIDAS=1, **{col: 0 for col in COLUNAS_SIMILARIDADE if col not in df.columns})
+    posicoes = df.drop_duplicates('PLAYER').set_index('PLAYER')['POSIÇÃO']
+    posicoes.index = posicoes.index.astype(object)
+    posicoes = posicoes.astype(object)
+
+    somas = df.groupby(['COMPETIÇÃO', 'PLAYER'], observed=True)[COLUNAS_SIMILARIDADE + ['PARTIDAS']].sum()
+    por_competicao = {TODAS: somas.groupby(level='PLAYER', observed=True).sum()}
+    for competicao, tabela in somas.groupby(level='COMPETIÇÃO', observed=True):
+        por_competicao[competicao] = tabela.droplevel('COMPETIÇÃO')
+
+    return Similaridade(competicoes={
+        competicao: _matriz(tabela, posicoes) for competicao, tabela in por_competicao.items()
+    })
+
+
+def _matriz(somas: pd.DataFrame, posicoes: pd.Series) -> MatrizSimilaridade:
+    somas = somas[somas['PARTIDAS'] > 0]
+    jogadores = somas.index.astype(object).to_numpy()
+    partidas = somas['PARTIDAS'].to_numpy()
+
+    medias = somas[COLUNAS_SIMILARIDADE].to_numpy(dtype=np.float64) / partidas[:, None]
+    centro, desvio = medias.mean(axis=0), medias.std(axis=0)
+    # Estatística igual para todos (ex.: ninguém recebeu vermelho) não diferencia ninguém: fica 0
+    vetores = np.divide(medias - centro, desvio, out=np.zeros_like(medias), where=desvio > 0).astype(np.float32)
+
+    return MatrizSimilaridade(
+        jogadores=jogadores,
+        posicoes=posicoes.reindex(jogadores).to_numpy(dtype=object),
+        partidas=partidas,
+        vetores=vetores,
+        normas=np.einsum('ij,ij->i', vetores, vetores),
+        linhas={jogador: linha for linha, jogador in enumerate(jogadores)},
+    )
@@ -0,0 +1,112 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+# Versão do formato do DataFrame tratado. Incrementar sempre que tratar_dataframe mudar colunas ou tipos:
+# arquivos gravados com outra versão são descartados na leitura.
+VERSAO_SCHEMA = 2
+
+# Pasta dos snapshots em disco (vazio desativa a persistência)
+PASTA_SNAPSHOTS = os.environ.get("DADOS_SNAPSHOT_PASTA", ".snapshots")
+
+# Chave dos metadados do arquivo Arrow com o cabeçalho do snapshot
+CHAVE_METADADOS = b"mr_league"
+
+COLUNAS_OBRIGATORIAS = ['COMPETIÇÃO', 'RODADA', 'PARTIDA', 'PLAYER', 'POSIÇÃO', 'TIME', 'PTS']
+
+
+def caminho_snapshot(fonte) -> str:
+    """
+    Arquivo do snapshot de uma fonte (um arquivo por fonte, nomeado pelo hash da sua descrição).
+    """
+    nome = hashlib.sha1(repr(fonte).encode()).hexdigest()[:16]
+    return os.path.join(PASTA_SNAPSHOTS, f"{nome}.arrow")
+
+
+def salvar_snapshot(fonte, df: pd.DataFrame, ingestao: dict) -> None:
+    """
+    Grava o DataFrame tratado em Arrow IPC, com cabeçalho (versão do schema, fonte e estado da ingestão).
+    A escrita é atômica: grava num arquivo temporário e renomeia.
+    """
+    if not PASTA_SNAPSHOTS:
+        return
+
+    # pyarrow importado só quando um snapshot é gravado ou lido (não na importação do app)
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    cabecalho = {
+        "versao_schema": VERSAO_SCHEMA,
+        "fonte": repr(fonte),
+        "ingestao": ingestao,
+    }
+    metadados = dict(tabela.schema.metadata or {})
+    metadados[CHAVE_METADADOS] = json.dumps(cabecalho).encode()
+    tabela = tabela.replace_schema_metadata(metadados)
+
+    caminho = caminho_snapshot(fonte)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with pa.OSFile(temporario, "wb") as arquivo, ipc.new_file(arquivo, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    os.replace(temporario, caminho)
+
+
+def ler_snapshot(fonte):
+    """
+    Lê o snapshot da fonte em disco (memory-mapped).
+
+    Retorna (df, ingestao) ou None quando o arquivo não existe, é de outra fonte,
+    foi gravado com outra versão do schema ou não tem as colunas esperadas.
+    """
+    if not PASTA_SNAPSHOTS:
+        return None
+
+    caminho = caminho_snapshot(fonte)
+    if not os.path.exists(caminho):
+        return None
+
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    try:
+        tabela = ipc.open_file(pa.memory_map(caminho, "r")).read_all()
+        cabecalho = json.loads((tabela.schema.metadata or {})[CHAVE_METADADOS])
+    except Exception as e:
+        print(f"[AVISO] Snapshot em disco ilegível ({caminho}): {str(e)}")
+        return None
+
+    if cabecalho.get("versao_schema") != VERSAO_SCHEMA or cabecalho.get("fonte") != repr(fonte):
+        return None
+    if any(col not in tabela.column_names for col in COLUNAS_OBRIGATORIAS):
+        return None
+
+    return tabela.to_pandas(), cabecalho.get("ingestao")
+
+
+def marcar_atualizacao_forcada(fonte):
+    """
+    Grava a marca de "atualização forçada" da fonte, vista pelos outros processos que usam a mesma pasta.
+    Retorna o momento da marca (mtime do arquivo) ou None com a persistência desativada.
+    """
+    if not PASTA_SNAPSHOTS:
+        return None
+    caminho = f"{caminho_snapshot(fonte)}.forcar"
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(repr(fonte))
+    return os.stat(caminho).st_mtime
+
+
+def momento_atualizacao_forcada(fonte):
+    """
+    Momento da última atualização forçada da fonte (mtime da marca) ou None se nunca houve.
+    """
+    if not PASTA_SNAPSHOTS:
+        return None
+    try:
+        return os.stat(f"{caminho_snapshot(fonte)}.forcar").st_mtime
+    except OSError:
+        return None
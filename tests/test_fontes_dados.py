@@ -0,0 +1,120 @@
+import pytest
+from src import fontes_dados
+from src.fontes_dados import ClienteSheets, FonteGoogleSheets, EsquemaAlterado
+
+
+class AbaFalsa:
+    """
+    Worksheet do gspread: responde ao batch_get com as linhas de cada intervalo pedido.
+    """
+
+    def __init__(self, cabecalho, linhas, erro=None):
+        self.cabecalho = cabecalho
+        self.linhas = linhas
+        self.erro = erro
+        self.intervalos = []
+
+    def batch_get(self, intervalos):
+        self.intervalos.append(list(intervalos))
+        if self.erro is not None:
+            raise self.erro
+        return [[self.cabecalho], self.linhas]
+
+
+class ClienteFalso:
+    """
+    Cliente do gspread: open_by_key(...).worksheet(...) devolve a próxima aba de `abas`.
+    """
+
+    def __init__(self, *abas):
+        self.abas = list(abas)
+        self.aberturas = []
+
+    def open_by_key(self, sheet_id):
+        cliente = self
+
+        class Planilha:
+            def worksheet(self, nome_aba):
+                cliente.aberturas.append((sheet_id, nome_aba))
+                return cliente.abas.pop(0)
+
+        return Planilha()
+
+
+@pytest.fixture
+def cliente_sheets(monkeypatch):
+    """
+    Troca o cliente do processo por um ClienteSheets com o stub; `autorizacoes` conta as autenticações.
+    """
+    def instalar(*abas):
+        stub = ClienteFalso(*abas)
+        autorizacoes = []
+
+        def autorizar():
+            autorizacoes.append(1)
+            return stub
+
+        cliente = ClienteSheets(autorizar=autorizar)
+        monkeypatch.setattr(fontes_dados, 'CLIENTE_SHEETS', cliente)
+        return cliente, stub, autorizacoes
+
+    return instalar
+
+
+def test_aba_fica_em_cache(cliente_sheets):
+    aba = AbaFalsa(['PLAYER'], [])
+    cliente, stub, autorizacoes = cliente_sheets(aba)
+
+    assert cliente.aba('planilha', 'main') is aba
+    assert cliente.aba('planilha', 'main') is aba
+    assert stub.aberturas == [('planilha', 'main')]
+    assert len(autorizacoes) == 1
+
+
+def test_descartar_apos_erro_resolve_a_aba_de_novo(cliente_sheets):
+    quebrada = AbaFalsa(['PLAYER'], [], erro=ConnectionError("conexão perdida"))
+    nova = AbaFalsa(['PLAYER'], [['Ana']])
+    _, stub, autorizacoes = cliente_sheets(quebrada, nova)
+    fonte = FonteGoogleSheets('planilha', 'main')
+
+    with pytest.raises(ConnectionError):
+        fonte.ler_a_partir_de(0, ['PLAYER'])
+
+    df = fonte.ler_a_partir_de(0, ['PLAYER'])
+    assert df['PLAYER'].tolist() == ['Ana']
+    assert stub.aberturas == [('planilha', 'main'), ('planilha', 'main')]
+    # O cliente autenticado é reaproveitado: só a aba é resolvida de novo
+    assert len(autorizacoes) == 1
+
+
+@pytest.mark.parametrize('linha, colunas, intervalo', [
+    (0, 3, 'A2:C'),
+    (9, 26, 'A11:Z'),
+    (120, 27, 'A122:AA'),
+    (1000, 53, 'A1002:BA'),
+])
+def test_ler_a_partir_de_pede_cabecalho_e_intervalo(cliente_sheets, linha, colunas, intervalo):
+    nomes = [f'C{indice}' for indice in range(colunas)]
+    aba = AbaFalsa(nomes, [])
+    cliente_sheets(aba)
+
+    FonteGoogleSheets('planilha', 'main').ler_a_partir_de(linha, nomes)
+
+    assert aba.intervalos == [['1:1', intervalo]]
+
+
+def test_ler_a_partir_de_completa_celulas_vazias(cliente_sheets):
+    # A API omite as células vazias do fim de cada linha
+    cliente_sheets(AbaFalsa(['PLAYER', 'GOL', 'ASS'], [['Ana', '2'], ['Bia', '', '1']]))
+
+    df = FonteGoogleSheets('planilha', 'main').ler_a_partir_de(0, ['PLAYER', 'GOL', 'ASS'])
+
+    assert df.shape == (2, 3)
+    assert df.isna().to_numpy().tolist() == [[False, False, True], [False, True, False]]
+
+
+def test_ler_a_partir_de_cabecalho_alterado(cliente_sheets):
+    cliente_sheets(AbaFalsa(['PLAYER', 'GOLS'], []))
+
+    with pytest.raises(EsquemaAlterado):
+        FonteGoogleSheets('planilha', 'main').ler_a_partir_de(0, ['PLAYER', 'GOL'])
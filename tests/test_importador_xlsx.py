@@ -0,0 +1,24 @@
+import csv
+import pandas as pd
+from benchmarks.gerador_liga import gerar_temporada
+from src.importador_xlsx import importar_xlsx
+
+
+def test_relatorio_em_pasta_nova_e_valores_fora_da_faixa(tmp_path):
+    planilha = gerar_temporada(jogadores=24, rodadas=2)
+    planilha.loc[1, 'GOL'] = '40000'
+    planilha.loc[2, 'RODADA'] = '-99999'
+    planilha.loc[3, 'PARTIDA'] = '1e9'
+    caminho = tmp_path / 'temporada.xlsx'
+    planilha.to_excel(caminho, sheet_name='main', index=False)
+
+    # "historico/" ainda não existe: o relatório e o dataset são criados dentro dela
+    resultado = importar_xlsx(str(caminho), str(tmp_path / 'historico' / '2023'))
+
+    assert resultado.linhas_rejeitadas == 3
+    assert resultado.linhas_importadas == len(planilha) - 3
+    with open(resultado.relatorio, encoding='utf-8') as arquivo:
+        rejeitadas = {(linha['linha'], linha['coluna']) for linha in csv.DictReader(arquivo)}
+    # Linha de dados i = linha i + 2 da planilha
+    assert rejeitadas == {('3', 'GOL'), ('4', 'RODADA'), ('5', 'PARTIDA')}
+    assert len(pd.read_parquet(tmp_path / 'historico' / '2023')) == resultado.linhas_importadas
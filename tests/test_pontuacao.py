@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from benchmarks.gerador_liga import gerar_temporada
+from src.data_loader import CRITERIOS, tratar_dataframe
+from src.pontuacao import calcular_pontos
+
+
+def pontos_linha_a_linha(row, criterios):
+    """
+    Cálculo original do tratar_dataframe (df.apply(..., axis=1)), mantido aqui como referência.
+    """
+    posicao = row['POSIÇÃO']
+    if posicao not in criterios:
+        return 0  # posição desconhecida
+    return sum(row[col] * criterios[posicao].get(col, 0) for col in criterios[posicao])
+
+
+@pytest.fixture(scope='module')
+def liga():
+    brutas = gerar_temporada(jogadores=60, rodadas=12, semente=7)
+    # Posições fora de CRITERIOS (digitadas errado ou em branco) valem 0 pontos
+    brutas.loc[brutas.index[::37], 'POSIÇÃO'] = 'TECNICO'
+    brutas.loc[brutas.index[5::53], 'POSIÇÃO'] = np.nan
+    return tratar_dataframe(brutas)
+
+
+def test_pontos_iguais_ao_calculo_linha_a_linha(liga):
+    esperado = liga.apply(pontos_linha_a_linha, axis=1, criterios=CRITERIOS)
+
+    # A liga gerada tem pontuações quebradas (pesos 8.5/2.5 do MEI), que o float64 tem de representar exatamente
+    assert (liga['PTS'] % 1 != 0).any()
+    np.testing.assert_array_equal(liga['PTS'].to_numpy(), esperado.to_numpy())
+
+
+def test_posicao_desconhecida_vale_zero(liga):
+    desconhecidas = ~liga['POSIÇÃO'].isin(list(CRITERIOS))
+
+    assert desconhecidas.sum() > 0
+    assert (liga.loc[desconhecidas, 'PTS'] == 0).all()
+
+
+def test_pesos_fracionarios_de_meia():
+    df = tratar_dataframe(gerar_temporada(jogadores=12, rodadas=2).head(0).reindex(range(3)).assign(
+        POSIÇÃO=['MEI', 'MEI', 'ATA'], STG=['1', '3', '1'], GOL=['1', '0', '1'], ASS=['0', '1', '0']
+    ))
+
+    # MEI: GOL 8.5, STG 2.5, ASS 5; ATA: GOL 7, STG 2
+    assert calcular_pontos(df, CRITERIOS).tolist() == [11.0, 12.5, 9.0]
+
+
+def test_tipo_inteiro_sem_pesos_fracionarios():
+    df = tratar_dataframe(gerar_temporada(jogadores=12, rodadas=2).head(0).reindex(range(2)).assign(
+        POSIÇÃO=['ATA', 'ZAG'], GOL=['1', '2'], V=['1', '0']
+    ))
+
+    pontos = calcular_pontos(df, CRITERIOS)
+    assert pontos.dtype.kind == 'i'
+    assert pontos.tolist() == [14, 20]